@@ -2,6 +2,7 @@ import matplotlib.pyplot as plt
 from matplotlib import colors
 import numpy as np
 import os
+from map_io import load_binary, save_binary, write_matrix
 
 def haritayi_gorsellestir(matris, mod):
     """
@@ -9,10 +10,10 @@ def haritayi_gorsellestir(matris, mod):
     mod 1: 0 (Engel), 1 (Boşluk)
     mod 2: 0 (Engel), 1 (Boşluk), 2 (Bilinmiyor)
     """
-    if not matris:
+    if matris is None or len(matris) == 0:
         return
 
-    np_matris = np.array(matris)
+    np_matris = np.asarray(matris, dtype=np.uint8) # memmap ise kopyalanmaz
     plt.figure(figsize=(8, 8))
 
     if mod == 1:
@@ -52,82 +53,166 @@ def haritayi_gorsellestir(matris, mod):
 
 def dosyadan_matris_oku(mod):
     """
-    Kullanıcıdan dosya adı alır, yorum satırlarını atlar 
-    ve seçilen moda uygun olup olmadığını denetler.
+    Kullanıcıdan dosya adı alır ve matris_yukle ile okur.
     """
-    gecerli_sayilar = [0, 1] if mod == 1 else [0, 1, 2]
     mod_adi = "0 ve 1" if mod == 1 else "0, 1 ve 2"
 
     print(f"\n--- {mod_adi} İçeren Dosya Okuma Modu ---")
     print(f"Lütfen sadece {mod_adi} rakamlarını içeren txt dosyasının adını girin.")
     dosya_yolu = input("Dosya adı (örn: harita.txt): ").strip()
 
+    return matris_yukle(dosya_yolu, mod)
+
+# Bayt -> sınıf tabloları (str.split() ile aynı ASCII boşluk karakterleri)
+BOSLUK_TABLOSU = np.zeros(256, dtype=bool)
+BOSLUK_TABLOSU[list(b" \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f")] = True
+RAKAM_TABLOSU = np.zeros(256, dtype=bool)
+RAKAM_TABLOSU[ord('0'):ord('9') + 1] = True
+
+def toplu_ayristir(satirlar):
+    """
+    Tek haneli sayılardan oluşan ASCII satırları bayt düzeyinde toplu ayrıştırır.
+    Dönen değer (degerler, satır başına eleman sayısı); satırlar bu biçime
+    uymuyorsa (çok haneli sayı, harf vb.) None.
+    """
+    metin = '\n'.join(satirlar)
+    if not metin.isascii():
+        return None
+
+    baytlar = np.frombuffer(metin.encode('ascii'), dtype=np.uint8)
+    dolu = ~BOSLUK_TABLOSU[baytlar]
+    if (dolu[1:] & dolu[:-1]).any():
+        return None # Birden fazla karakterli eleman var
+
+    rakamlar = baytlar[dolu]
+    if not RAKAM_TABLOSU[rakamlar].all():
+        return None
+
+    satir_baslari = np.concatenate(([0], np.flatnonzero(baytlar == ord('\n')) + 1))
+    uzunluklar = np.add.reduceat(dolu, satir_baslari, dtype=np.int64)
+    return (rakamlar - ord('0')).astype(np.int64), uzunluklar
+
+def matris_yukle(dosya_yolu, mod):
+    """
+    Verilen yoldaki txt dosyasını NumPy dizisi (uint8) olarak okur.
+    Yorum ve boş satırları atlar; sayı, mod ve dikdörtgenlik kontrollerini
+    toplu (vektörel) yapar. Hata varsa mesaj yazdırıp None döndürür.
+    """
+    gecerli_sayilar = [0, 1] if mod == 1 else [0, 1, 2]
+    mod_adi = "0 ve 1" if mod == 1 else "0, 1 ve 2"
+
     if not os.path.exists(dosya_yolu):
         print(f"\nHATA: '{dosya_yolu}' adında bir dosya bulunamadı.")
         return None
 
-    matris = []
-    
     try:
         with open(dosya_yolu, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-            
-            for satir_no, satir in enumerate(lines):
-                satir = satir.strip()
-                
-                # 1. Boş satırları atla
-                if not satir: continue 
-                
-                # 2. Yorum satırlarını atla (# ile başlayanlar) - GÜNCELLENEN KISIM
-                if satir.startswith('#'): continue
-
-                # Satır içi yorumları temizle (Örn: "0 0 1 # Bu bir duvar")
-                if '#' in satir:
-                    satir = satir.split('#')[0].strip()
-                    if not satir: continue # Eğer yorumdan önce bir şey yoksa atla
-                
-                elemanlar = satir.split()
-                
-                try:
-                    sayisal_satir = [int(x) for x in elemanlar]
-                except ValueError:
-                    print(f"HATA: {satir_no+1}. satırda sayı olmayan karakterler var.")
-                    return None
-
-                # Seçilen moda göre sayı kontrolü
-                if any(x not in gecerli_sayilar for x in sayisal_satir):
-                    print(f"HATA: {satir_no+1}. satırda {gecerli_sayilar} dışında rakamlar var.")
-                    print(f"Seçilen Mod: {mod} (Sadece {mod_adi} kabul edilir)")
-                    return None
-                
-                matris.append(sayisal_satir)
-        
-        # Dikdörtgenlik kontrolü
-        if matris:
-            ilk_satir_uzunlugu = len(matris[0])
-            for i, satir in enumerate(matris):
-                if len(satir) != ilk_satir_uzunlugu:
-                    print(f"HATA: Matris düzgün değil! {i+1}. satırın (yorumsuz) uzunluğu farklı.")
-                    return None
-        else:
+            lines = f.read().split('\n')
+
+        # Yorumları (# sonrası) ve boş satırları at, dosyadaki satır numarasını sakla
+        satirlar = []
+        satir_nolari = []
+        for satir_no, satir in enumerate(lines):
+            satir = satir.split('#', 1)[0].strip()
+            if satir:
+                satirlar.append(satir)
+                satir_nolari.append(satir_no)
+
+        if not satirlar:
             print("HATA: Dosyada geçerli veri bulunamadı (Tüm satırlar boş veya yorum olabilir).")
             return None
-                
-        return matris
+
+        def mod_hatasi(satir_no):
+            print(f"HATA: {satir_no+1}. satırda {gecerli_sayilar} dışında rakamlar var.")
+            print(f"Seçilen Mod: {mod} (Sadece {mod_adi} kabul edilir)")
+
+        sonuc = toplu_ayristir(satirlar)
+        if sonuc is not None:
+            degerler, uzunluklar = sonuc
+        else:
+            # Genel yol: Çok haneli sayılar veya hatalı karakterler
+            tokenler = [satir.split() for satir in satirlar]
+            uzunluklar = np.array([len(t) for t in tokenler])
+            try:
+                degerler = np.array([x for t in tokenler for x in t]).astype(np.int64)
+            except ValueError:
+                # Hatalı satırı bul (sadece hata durumunda satır satır bakılır)
+                for satir_no, t in zip(satir_nolari, tokenler):
+                    try:
+                        sayisal_satir = [int(x) for x in t]
+                    except ValueError:
+                        print(f"HATA: {satir_no+1}. satırda sayı olmayan karakterler var.")
+                        return None
+                    if any(x not in gecerli_sayilar for x in sayisal_satir):
+                        mod_hatasi(satir_no)
+                        return None
+                degerler = np.array([int(x) for t in tokenler for x in t])
+
+        # Seçilen moda göre sayı kontrolü (ilk hatalı değerin satırı raporlanır)
+        hatali = np.flatnonzero(~np.isin(degerler, gecerli_sayilar))
+        if len(hatali):
+            satir = np.searchsorted(np.cumsum(uzunluklar), hatali[0], side='right')
+            mod_hatasi(satir_nolari[satir])
+            return None
+
+        # Dikdörtgenlik kontrolü
+        farkli = np.flatnonzero(uzunluklar != uzunluklar[0])
+        if len(farkli):
+            print(f"HATA: Matris düzgün değil! {farkli[0]+1}. satırın (yorumsuz) uzunluğu farklı.")
+            return None
+
+        return degerler.reshape(len(uzunluklar), uzunluklar[0]).astype(np.uint8)
 
     except Exception as e:
         print(f"Bir hata oluştu: {e}")
         return None
 
+def ikili_harita_ac(dosya_yolu):
+    """
+    İkili (.rsm) haritayı np.memmap ile kopyalamadan açar.
+    Dönen matris txt dosyalarıyla aynı yöndedir (satırlar y); hata varsa (None, None).
+    """
+    if not os.path.exists(dosya_yolu):
+        print(f"\nHATA: '{dosya_yolu}' adında bir dosya bulunamadı.")
+        return None, None
+    try:
+        grid, metadata = load_binary(dosya_yolu)
+    except (ValueError, OSError) as e:
+        print(f"HATA: {e}")
+        return None, None
+    return grid.T, metadata
+
+def txt_den_ikiliye(txt_yolu, ikili_yolu):
+    """txt matrisini ikili (.rsm) dosyaya çevirir."""
+    matris = matris_yukle(txt_yolu, mod=2)
+    if matris is None:
+        return False
+    save_binary(matris.T, ikili_yolu)
+    print(f"İkili harita kaydedildi: {ikili_yolu}")
+    return True
+
+def ikiliden_txt_ye(ikili_yolu, txt_yolu):
+    """İkili (.rsm) haritayı txt matrisine çevirir; metadata yorum satırı olarak yazılır."""
+    matris, metadata = ikili_harita_ac(ikili_yolu)
+    if matris is None:
+        return False
+    baslik = [f"# {anahtar}: {deger}" for anahtar, deger in metadata.items()]
+    write_matrix(matris.T, txt_yolu, baslik)
+    print(f"Metin harita kaydedildi: {txt_yolu}")
+    return True
+
 # --- Programı Başlat ---
 if __name__ == "__main__":
     while True:
         print("\n--- HARİTA GÖRSELLEŞTİRİCİ ---")
         print("1. Sadece 0 ve 1 (Engel / Boşluk)")
         print("2. 0, 1 ve 2 (Engel / Boşluk / Bilinmiyor)")
+        print("3. İkili harita (.rsm) aç")
+        print("4. txt -> İkili (.rsm) çevir")
+        print("5. İkili (.rsm) -> txt çevir")
         print("Q. Çıkış")
         
-        secim = input("Seçiminiz (1/2/Q): ").strip().upper()
+        secim = input("Seçiminiz (1/2/3/4/5/Q): ").strip().upper()
         
         if secim == 'Q':
             print("Programdan çıkılıyor...")
@@ -142,5 +227,14 @@ if __name__ == "__main__":
             if veri is not None:
                 print("\nHarita başarıyla yüklendi, çiziliyor...")
                 haritayi_gorsellestir(veri, mod=2)
+        elif secim == '3':
+            veri, metadata = ikili_harita_ac(input("Dosya adı (örn: harita.rsm): ").strip())
+            if veri is not None:
+                print(f"\nHarita açıldı {metadata}, çiziliyor...")
+                haritayi_gorsellestir(veri, mod=2)
+        elif secim == '4':
+            txt_den_ikiliye(input("txt dosyası: ").strip(), input("İkili dosya (.rsm): ").strip())
+        elif secim == '5':
+            ikiliden_txt_ye(input("İkili dosya (.rsm): ").strip(), input("txt dosyası: ").strip())
         else:
             print("Geçersiz seçim, lütfen tekrar deneyin.")
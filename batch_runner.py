@@ -0,0 +1,106 @@
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+import kod1
+import kod4
+
+# Strateji adı -> kod4.run_headless parametreleri
+STRATEGIES = {
+    "nearest_r3": {"view_range": 3, "strategy": "nearest"},
+    "nearest_r5": {"view_range": 5, "strategy": "nearest"},
+    "nearest_r3_noreplan": {"view_range": 3, "replan": False, "strategy": "nearest"},
+    "nearest_r3_team2": {"view_range": 3, "strategy": "nearest", "robots": 2},
+    "nearest_r3_team4": {"view_range": 3, "strategy": "nearest", "robots": 4},
+    "info_gain_r3": {"view_range": 3, "strategy": "info_gain"},
+    "info_gain_r5": {"view_range": 5, "strategy": "info_gain"},
+    "small_segments_r3": {"view_range": 3, "strategy": "small_segments"},
+}
+SAMPLE_EVERY = 10
+
+def run_one(seed, strategy, params, cols, rows):
+    """
+    Tek koşu: Tohumlu ada haritasında headless keşif (işçi süreçte çalışır).
+    Tick, yol ve kapsama sonuçları aynı tohum için her seferinde aynıdır;
+    süreler (planning_cpu_time, cpu_time) ölçümdür ve değişebilir.
+    """
+    real_map = kod1.generate_island_map(cols, rows, random.Random(seed))
+
+    cpu_start = time.process_time()
+    stats = kod4.run_headless(real_map, sample_every=SAMPLE_EVERY, **params)
+    return {
+        "seed": seed,
+        "strategy": strategy,
+        "ticks": stats["ticks"],
+        "path_length": stats["path_length"],
+        "finished": stats["finished"],
+        "coverage": stats["coverage"],
+        "planning_cpu_time": stats["planning_cpu_time"],
+        "cpu_time": time.process_time() - cpu_start,
+    }
+
+def run_batch(seeds, strategies=STRATEGIES, cols=kod4.COLS, rows=kod4.ROWS, workers=None):
+    """seeds x strategies koşusunu süreç havuzuna dağıtır; sonuçlar (strateji, tohum) sırasındadır."""
+    jobs = [(seed, name, params) for name, params in strategies.items() for seed in seeds]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_one, seed, name, params, cols, rows) for seed, name, params in jobs]
+        return [future.result() for future in futures]
+
+def coverage_curve(runs):
+    """Koşuların ortalama kapsama eğrisi: [(tick, ortalama keşif oranı), ...]"""
+    max_ticks = max(r["ticks"] for r in runs)
+    ticks = np.arange(SAMPLE_EVERY, max_ticks + SAMPLE_EVERY, SAMPLE_EVERY)
+    curves = []
+    for r in runs:
+        t, ratio = zip(*r["coverage"])
+        # Erken biten koşu, son oranında kalır
+        curves.append(np.interp(ticks, t, ratio))
+    return [(int(t), float(c)) for t, c in zip(ticks, np.mean(curves, axis=0))]
+
+def aggregate(runs):
+    """Strateji bazında özet: bitiş, tick, yol, planlama ve CPU süresi, kapsama eğrisi."""
+    summary = {}
+    for name in dict.fromkeys(r["strategy"] for r in runs):
+        group = [r for r in runs if r["strategy"] == name]
+        summary[name] = {
+            "runs": len(group),
+            "finished": sum(r["finished"] for r in group),
+            "mean_ticks": float(np.mean([r["ticks"] for r in group])),
+            "mean_path_length": float(np.mean([r["path_length"] for r in group])),
+            "total_path_length": float(np.sum([r["path_length"] for r in group])),
+            "planning_cpu_time": float(np.sum([r["planning_cpu_time"] for r in group])),
+            "cpu_time": float(np.sum([r["cpu_time"] for r in group])),
+            "coverage": coverage_curve(group),
+        }
+    return summary
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tohumlu haritalarda toplu (paralel) headless keşif")
+    parser.add_argument("--seeds", type=int, default=16, help="Harita sayısı (tohumlar 0..N-1)")
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--strategies", default=",".join(STRATEGIES), help="örn: nearest_r3,nearest_r5")
+    parser.add_argument("--size", default=f"{kod4.COLS}x{kod4.ROWS}", help="Harita boyutu, örn: 200x200")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--output", default="batch_results.json")
+    args = parser.parse_args()
+
+    seeds = range(args.first_seed, args.first_seed + args.seeds)
+    strategies = {name: STRATEGIES[name] for name in args.strategies.split(",")}
+    cols, rows = (int(v) for v in args.size.split("x"))
+
+    t0 = time.perf_counter()
+    runs = run_batch(seeds, strategies, cols, rows, workers=args.workers)
+    summary = aggregate(runs)
+    print(f"{len(runs)} koşu {time.perf_counter() - t0:.2f} sn'de tamamlandı.")
+
+    for name, s in summary.items():
+        print(f"{name:<20} bitti: {s['finished']}/{s['runs']}  ort. tick: {s['mean_ticks']:.0f}  "
+              f"ort. yol: {s['mean_path_length']:.1f}  planlama CPU: {s['planning_cpu_time']:.2f} sn  CPU: {s['cpu_time']:.2f} sn")
+
+    with open(args.output, "w") as f:
+        json.dump({"summary": summary, "runs": runs}, f, indent=2)
+    print(f"Sonuçlar kaydedildi: {args.output}")
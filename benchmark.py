@@ -0,0 +1,175 @@
+import argparse
+import json
+import os
+import platform
+import random
+import tempfile
+import time
+import numpy as np
+
+from planner import a_star_search, jump_point_search, path_cost, VAL_UNKNOWN, VAL_FREE
+from frontier import FrontierIndex
+from map_io import write_matrix, save_binary
+import kod1
+import kod4
+
+# --- AYARLAR ---
+SIZES = [(40, 30), (200, 200), (1000, 1000)]
+# Headless keşfin ölçüldüğü boyutlar (1000x1000 tek koşuda bile çok uzun sürer)
+EXPLORATION_SIZES = [(40, 30), (200, 200)]
+SEED = 1234
+REPEATS = 3
+# Sınır parçası seçiminde sensör yarıçapı (kod4 robotu ile aynı)
+VIEW_RANGE = 3
+# Bu kare sayısının üstündeki haritalarda her ölçüm tek sefer yapılır
+LARGE_MAP_CELLS = 200 * 200
+
+def make_map(cols, rows, seed=SEED):
+    """Ada sayısı alanla ölçeklenen, tohumlu (seed) ada haritası."""
+    num_islands = max(7, cols * rows // 250)
+    return kod1.generate_island_map(cols, rows, random.Random(seed), num_islands)
+
+def best_time(func, repeats):
+    """func'ı repeats kez çalıştırır; (en iyi süre, son dönüş değeri)."""
+    best = float("inf")
+    result = None
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+def corner_cells(grid):
+    """Sol üst ve sağ alt köşeye en yakın boş kareler."""
+    free = np.argwhere(grid == VAL_FREE)
+    diagonal = free.sum(axis=1)
+    start = free[np.argmin(diagonal)]
+    goal = free[np.argmax(diagonal)]
+    return (int(start[0]), int(start[1])), (int(goal[0]), int(goal[1]))
+
+# --- ÖLÇÜMLER ---
+
+def bench_map_generation(cols, rows, repeats):
+    seconds, _ = best_time(lambda: make_map(cols, rows), repeats)
+    results = [{"benchmark": "generate_island_map", "seconds": seconds}]
+    if (cols, rows) == (kod4.COLS, kod4.ROWS):
+        seconds, _ = best_time(kod4.generate_map, repeats)
+        results.append({"benchmark": "generate_map", "seconds": seconds})
+    return results
+
+def bench_a_star(grid, repeats):
+    """A* ve Jump Point Search, 4 ve 8 komşulukta (yol maliyetleri aynı olmalı)."""
+    start, goal = corner_cells(grid)
+    results = []
+    for diagonal in (False, True):
+        suffix = "_diagonal" if diagonal else ""
+        for name, search in (("a_star_search", a_star_search), ("jump_point_search", jump_point_search)):
+            seconds, path = best_time(lambda: search(grid, start, goal, diagonal=diagonal), repeats)
+            results.append({"benchmark": name + suffix, "seconds": seconds, "path_length": len(path),
+                            "path_cost": round(path_cost(start, path), 3)})
+    return results
+
+def bench_frontier(grid, repeats):
+    """
+    Sol yarısı açılmış hafızada sınır kümesinin kurulması ve kod4'ün hedef
+    aramaları: en yakın sınır (search) ve sınır parçası seçimi (select).
+    """
+    cols, rows = grid.shape
+    known = np.full(grid.shape, VAL_UNKNOWN, dtype=np.uint8)
+    known[:cols // 2] = grid[:cols // 2]
+    revealed = np.nonzero(known != VAL_UNKNOWN)
+
+    def build():
+        index = FrontierIndex(cols, rows)
+        index.update(known, revealed)
+        return index
+
+    update_seconds, index = best_time(build, repeats)
+    start, _ = corner_cells(grid)
+    search_seconds, found = best_time(lambda: index.search(known, start), repeats)
+    select_seconds, selected = best_time(lambda: index.select(known, start, VIEW_RANGE), repeats)
+    return [
+        {"benchmark": "frontier_update", "seconds": update_seconds, "frontier_cells": len(index)},
+        {"benchmark": "frontier_search", "seconds": search_seconds, "path_length": len(found[0][1]) if found else 0},
+        {"benchmark": "frontier_select", "seconds": select_seconds, "path_length": len(selected[0][1]) if selected else 0},
+    ]
+
+def bench_save(grid, repeats):
+    with tempfile.TemporaryDirectory() as tmp:
+        txt_path = os.path.join(tmp, "harita.txt")
+        bin_path = os.path.join(tmp, "harita.rsm")
+        txt_seconds, _ = best_time(lambda: write_matrix(grid, txt_path), repeats)
+        bin_seconds, _ = best_time(lambda: save_binary(grid, bin_path), repeats)
+    return [
+        {"benchmark": "save_txt", "seconds": txt_seconds},
+        {"benchmark": "save_binary", "seconds": bin_seconds},
+    ]
+
+def bench_exploration(cols, rows, repeats):
+    """Tohumlu ada haritasında headless keşif (kod4.run_headless)."""
+    real_map = make_map(cols, rows)
+    seconds, stats = best_time(lambda: kod4.run_headless(real_map), repeats)
+    return [{
+        "benchmark": "headless_exploration",
+        "seconds": seconds,
+        "ticks": stats["ticks"],
+        "path_length": stats["path_length"],
+        "planning_cpu_time": stats["planning_cpu_time"],
+        "finished": stats["finished"],
+    }]
+
+def run_benchmarks(sizes=SIZES, exploration_sizes=EXPLORATION_SIZES, repeats=REPEATS):
+    results = []
+    for cols, rows in sizes:
+        n = repeats if cols * rows <= LARGE_MAP_CELLS else 1
+        grid = make_map(cols, rows)
+        group = bench_map_generation(cols, rows, n)
+        group += bench_a_star(grid, n)
+        group += bench_frontier(grid, n)
+        group += bench_save(grid, n)
+        if (cols, rows) in exploration_sizes:
+            group += bench_exploration(cols, rows, n)
+        for result in group:
+            result["size"] = f"{cols}x{rows}"
+            print(f"{result['size']:>10}  {result['benchmark']:<28} {result['seconds'] * 1000:10.2f} ms")
+        results += group
+    return results
+
+def compare(results, baseline_path):
+    """Önceki bir sonuç dosyasına göre süre oranlarını yazdırır (>1: yavaşlama)."""
+    with open(baseline_path) as f:
+        baseline = {(r["size"], r["benchmark"]): r["seconds"] for r in json.load(f)["results"]}
+    print(f"\n--- Karşılaştırma: {baseline_path} ---")
+    for r in results:
+        old = baseline.get((r["size"], r["benchmark"]))
+        if old:
+            print(f"{r['size']:>10}  {r['benchmark']:<28} x{r['seconds'] / old:6.2f}")
+
+def parse_sizes(text):
+    return [tuple(int(v) for v in size.split("x")) for size in text.split(",")]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Planlama, sınır arama ve harita üretimi ölçümleri")
+    parser.add_argument("--sizes", type=parse_sizes, default=SIZES, help="örn: 40x30,200x200")
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", help="Karşılaştırılacak önceki sonuç dosyası")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.sizes, EXPLORATION_SIZES, args.repeats)
+    report = {
+        "meta": {
+            "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "seed": SEED,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Sonuçlar kaydedildi: {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
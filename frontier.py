@@ -0,0 +1,160 @@
+from collections import deque
+import numpy as np
+from planner import VAL_UNKNOWN, VAL_FREE, VAL_WALL, NEIGHBORS, tree_path
+from regions import label_regions
+from sensor import window_count
+
+# Bilgi kazancı seçiminde, açılacak bir bilinmeyen karenin yol maliyeti
+# cinsinden ağırlığı (bkz. FrontierIndex.select): 4 yeni kare, 1 kare yola değer
+GAIN_WEIGHT = 0.25
+
+def frontier_mask(grid, x0, x1, y0, y1):
+    """grid[x0:x1, y0:y1] bölgesinde, 4 komşusundan biri Bilinmeyen olan Boş kareler."""
+    cols, rows = grid.shape
+    px0, px1 = max(x0 - 1, 0), min(x1 + 1, cols)
+    py0, py1 = max(y0 - 1, 0), min(y1 + 1, rows)
+
+    # Harita dışı komşular 'Bilinmeyen' sayılmaz
+    unknown = np.zeros((x1 - x0 + 2, y1 - y0 + 2), dtype=bool)
+    unknown[px0 - x0 + 1:px1 - x0 + 1, py0 - y0 + 1:py1 - y0 + 1] = grid[px0:px1, py0:py1] == VAL_UNKNOWN
+
+    near_unknown = unknown[:-2, 1:-1] | unknown[2:, 1:-1] | unknown[1:-1, :-2] | unknown[1:-1, 2:]
+    return (grid[x0:x1, y0:y1] == VAL_FREE) & near_unknown
+
+def is_claimed(cell, claimed, claim_range):
+    """cell, claimed karelerinden birine claim_range (Chebyshev) mesafesinde mi?"""
+    x, y = cell
+    return any(abs(x - cx) <= claim_range and abs(y - cy) <= claim_range for cx, cy in claimed)
+
+class FrontierIndex:
+    """
+    Sınır (Frontier) kümesi: En az bir 'Bilinmeyen' komşusu olan 'Boş' kareler.
+    Her taramada sadece yeni açılan kareler ve komşuları yeniden
+    değerlendirilir, haritanın tamamı taranmaz.
+    """
+    def __init__(self, cols, rows):
+        self.cols = cols
+        self.rows = rows
+        self.cells = set()
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, cell):
+        return cell in self.cells
+
+    def update(self, grid, revealed):
+        """
+        Yeni açılan karelerin (revealed = (xs, ys)) bir kare genişletilmiş
+        çerçevesini vektörel olarak yeniden değerlendirir.
+        """
+        xs, ys = revealed
+        if len(xs) == 0:
+            return
+        x0, x1 = max(int(xs.min()) - 1, 0), min(int(xs.max()) + 2, self.cols)
+        y0, y1 = max(int(ys.min()) - 1, 0), min(int(ys.max()) + 2, self.rows)
+
+        mask = frontier_mask(grid, x0, x1, y0, y1)
+        free = grid[x0:x1, y0:y1] == VAL_FREE
+
+        fx, fy = np.nonzero(mask)
+        self.cells.update(zip((fx + x0).tolist(), (fy + y0).tolist()))
+        ox, oy = np.nonzero(free & ~mask)
+        self.cells.difference_update(zip((ox + x0).tolist(), (oy + y0).tolist()))
+
+    def copy(self):
+        """Kümenin kopyası (arka planda planlama için anlık görüntü)."""
+        index = FrontierIndex(self.cols, self.rows)
+        index.cells = set(self.cells)
+        return index
+
+    def expand(self, grid, start, allow_unknown=True, claimed=(), claim_range=0):
+        """
+        start'tan BFS ile yayılır; ziyaret edilen sınır karelerini yol
+        uzunluğu sırasıyla (hedef, mesafe, came_from) olarak verir. came_from,
+        ebeveyn yönlerini (NEIGHBORS indeksi) tutan canlı sözlüktür; bir
+        karenin yolu, o kare verildiği anda planner.tree_path ile çıkarılabilir.
+        Mesafe ve ebeveyn sözlükleri sadece ziyaret edilen kareleri tutar,
+        geçilebilirlik de kareye ulaşınca bakılır: Yakındaki bir sınır için
+        arama maliyeti harita boyutuna bağlı değildir.
+        Başlangıç karesi hedef olarak verilmez (komşuları verilebilir);
+        claimed (başka robotların hedefleri) karelerine claim_range
+        (Chebyshev) mesafesindeki kareler de verilmez.
+        """
+        grid = np.asarray(grid)
+        cols, rows = grid.shape
+        start = tuple(start)
+        dist = {start: 0}
+        came_from = {}
+        queue = deque([start])
+
+        while queue:
+            cell = queue.popleft()
+            d_next = dist[cell] + 1
+            if cell != start and cell in self.cells and not is_claimed(cell, claimed, claim_range):
+                yield cell, d_next - 1, came_from
+
+            cx, cy = cell
+            for d, (i, j) in enumerate(NEIGHBORS):
+                nx, ny = cx + i, cy + j
+                if not (0 <= nx < cols and 0 <= ny < rows) or (nx, ny) in dist:
+                    continue
+                value = grid.item(nx, ny)
+                if value == VAL_WALL or (not allow_unknown and value != VAL_FREE):
+                    continue
+                dist[(nx, ny)] = d_next
+                came_from[(nx, ny)] = d
+                queue.append((nx, ny))
+
+    def search(self, grid, start, k=1, allow_unknown=True, claimed=(), claim_range=0):
+        """
+        Tek geçişli sınır planlayıcı: Yol uzunluğuna göre en yakın k sınır
+        karesi ve yolları aynı BFS geçişinden çıkarılır; ayrıca A* gerekmez.
+        Dönen değer [(hedef, yol), ...]; yol başlangıcı içermez, hedefi içerir.
+        Ulaşılabilir sınır yoksa [].
+        """
+        found = []
+        for cell, _, came_from in self.expand(grid, start, allow_unknown, claimed, claim_range):
+            found.append((cell, tree_path(came_from, start, cell)))
+            if len(found) >= k:
+                break
+        return found
+
+    def segments(self):
+        """Sınır kareleri 8 komşulukla bağlı parçalara (segment) ayrılır; etiket dizisi döner."""
+        mask = np.zeros((self.cols, self.rows), dtype=bool)
+        if self.cells:
+            xs, ys = zip(*self.cells)
+            mask[list(xs), list(ys)] = True
+        return label_regions(mask, diagonal=True)[0]
+
+    def select(self, grid, start, view_range, gain_weight=GAIN_WEIGHT, allow_unknown=True, claimed=(), claim_range=0):
+        """
+        Bilgi kazancı ile hedef seçimi. Her sınır parçasına, BFS ile ilk
+        ulaşılan (en yakın) karesinden girilir. O karede sensör penceresinin
+        açacağı bilinmeyen kare sayısı (kazanç) ile yol uzunluğu (maliyet)
+        birleştirilir: puan = maliyet - gain_weight * kazanç, en düşüğü seçilir.
+        gain_weight > 0: Çok alan açacak parçalar, gain_weight kadar uzakta
+        olsalar da tercih edilir. gain_weight < 0: Küçük kazançlı parçalar
+        (köşelerde kalan kırıntılar) yakındayken önce bitirilir.
+        Kazanç pencere alanını geçemediği için arama, en iyi puanın
+        aşılamayacağı mesafede durur.
+        Dönen değer search ile aynı biçimdedir.
+        """
+        labels = self.segments()
+        max_bonus = max(gain_weight, 0) * (2 * view_range + 1) ** 2
+        entered = set()
+        best = None
+        for cell, dist, came_from in self.expand(grid, start, allow_unknown, claimed, claim_range):
+            if best is not None and dist - max_bonus >= best[0]:
+                break
+            segment = labels[cell]
+            if segment in entered:
+                continue
+            entered.add(segment)
+            score = dist - gain_weight * window_count(grid, cell[0], cell[1], view_range, VAL_UNKNOWN)
+            if best is None or score < best[0]:
+                best = (score, cell, tree_path(came_from, start, cell))
+        if best is None:
+            return []
+        return [(best[1], best[2])]
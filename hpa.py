@@ -0,0 +1,232 @@
+import heapq
+import numpy as np
+from planner import NEIGHBORS, passable_mask, heuristic
+
+# Küme (cluster) kenar uzunluğu (kare)
+CLUSTER_SIZE = 10
+# Bu uzunluktan kısa giriş parçalarına ortasından tek geçit, uzunlara iki uçtan geçit konur
+MAX_SINGLE_ENTRANCE = 6
+
+class HPAPlanner:
+    """
+    Hiyerarşik yol bulma (HPA*).
+    Harita CLUSTER_SIZE x CLUSTER_SIZE kümelere bölünür. Komşu kümeler
+    arasındaki ortak kenarda iki tarafı da geçilebilir olan parçalara geçit
+    (entrance) konur; her kümenin geçitleri arasındaki mesafeler küme içinde
+    BFS ile önceden hesaplanır. Sorgu, küçük soyut grafikte A* ve ardından
+    küme içi yerel aramalarla yolun kareye açılmasıdır.
+    Sensör bir kareyi değiştirince (update) sadece o kare(ler)in kümesi ve
+    kenar komşuları kirli işaretlenir; sonraki sorguda yeniden kurulur.
+    Bulunan yol en kısa yola çok yakındır ama her zaman en kısa değildir.
+    """
+    def __init__(self, grid, cluster_size=CLUSTER_SIZE, allow_unknown=False):
+        self.grid = grid # Canlı referans (robotun hafızası)
+        self.cols, self.rows = grid.shape
+        self.size = cluster_size
+        self.allow_unknown = allow_unknown
+        self.ccols = -(-self.cols // cluster_size)
+        self.crows = -(-self.rows // cluster_size)
+
+        self.borders = {} # (küme_a, küme_b) -> [(kare_a, kare_b), ...] geçitler
+        self.links = {}   # geçit karesi -> karşı kümedeki geçit kareleri
+        self.nodes = {}   # küme -> geçit kareleri
+        self.edges = {}   # küme -> {geçit: [(diğer geçit, mesafe), ...]}
+        self.dirty = {(cx, cy) for cx in range(self.ccols) for cy in range(self.crows)}
+
+    # --- KÜMELER ---
+
+    def cluster_of(self, cell):
+        return cell[0] // self.size, cell[1] // self.size
+
+    def bounds(self, cluster):
+        cx, cy = cluster
+        x0, y0 = cx * self.size, cy * self.size
+        return x0, min(x0 + self.size, self.cols), y0, min(y0 + self.size, self.rows)
+
+    def cluster_neighbors(self, cluster):
+        cx, cy = cluster
+        for i, j in NEIGHBORS:
+            nx, ny = cx + i, cy + j
+            if 0 <= nx < self.ccols and 0 <= ny < self.crows:
+                yield nx, ny
+
+    def update(self, cells):
+        """Sensörün değiştirdiği karelerin (cells = (xs, ys)) kümelerini kirli işaretler."""
+        xs, ys = cells
+        if len(xs) == 0:
+            return
+        # Kenardaki bir kare, komşu kümenin geçitlerini de etkiler
+        for dx, dy in [(0, 0)] + NEIGHBORS:
+            cx = np.clip(xs + dx, 0, self.cols - 1) // self.size
+            cy = np.clip(ys + dy, 0, self.rows - 1) // self.size
+            self.dirty.update(zip(cx.tolist(), cy.tolist()))
+
+    # --- SOYUT GRAFİĞİN KURULMASI ---
+
+    def refresh(self):
+        """Kirli kümelerin kenarlarını, geçitlerini ve iç mesafelerini yeniden kurar."""
+        if not self.dirty:
+            return
+        affected = set(self.dirty)
+        for cluster in self.dirty:
+            for other in self.cluster_neighbors(cluster):
+                pair = (min(cluster, other), max(cluster, other))
+                self.build_border(pair)
+                affected.add(other)
+        self.dirty.clear()
+
+        for cluster in affected:
+            nodes = set()
+            for other in self.cluster_neighbors(cluster):
+                pair = (min(cluster, other), max(cluster, other))
+                for a, b in self.borders.get(pair, ()):
+                    nodes.add(a if self.cluster_of(a) == cluster else b)
+            self.nodes[cluster] = sorted(nodes)
+            self.build_edges(cluster)
+
+    def build_border(self, pair):
+        """İki komşu küme arasındaki kenarda geçitleri bulur."""
+        for a, b in self.borders.pop(pair, ()):
+            self.links.get(a, set()).discard(b)
+            self.links.get(b, set()).discard(a)
+
+        (ax, ay), (bx, by) = pair
+        x0, x1, y0, y1 = self.bounds(pair[0])
+        if ax != bx: # Dikey kenar: a'nın son sütunu | b'nin ilk sütunu
+            line = [((x1 - 1, y), (x1, y)) for y in range(y0, y1)]
+        else:        # Yatay kenar: a'nın son satırı | b'nin ilk satırı
+            line = [((x, y1 - 1), (x, y1)) for x in range(x0, x1)]
+
+        xs = [c[0] for pair_cells in line for c in pair_cells]
+        ys = [c[1] for pair_cells in line for c in pair_cells]
+        open_ = passable_mask(self.grid[xs, ys], self.allow_unknown).reshape(-1, 2).all(axis=1).tolist()
+
+        entrances = []
+        start = None
+        for i, is_open in enumerate(open_ + [False]):
+            if is_open and start is None:
+                start = i
+            elif not is_open and start is not None:
+                length = i - start
+                if length < MAX_SINGLE_ENTRANCE:
+                    entrances.append(line[start + length // 2])
+                else:
+                    entrances += [line[start], line[i - 1]]
+                start = None
+
+        self.borders[pair] = entrances
+        for a, b in entrances:
+            self.links.setdefault(a, set()).add(b)
+            self.links.setdefault(b, set()).add(a)
+
+    def local_search(self, start, cluster, goal=None):
+        """
+        Küme içinde start'tan BFS. goal verilirse yolu (başlangıç hariç)
+        döndürür, yoksa None; verilmezse kümedeki karelere mesafe sözlüğü.
+        """
+        x0, x1, y0, y1 = self.bounds(cluster)
+        passable = passable_mask(self.grid[x0:x1, y0:y1], self.allow_unknown).reshape(x1 - x0, y1 - y0).tolist()
+        dist = {start: 0}
+        parent = {}
+        frontier = [start]
+        while frontier:
+            next_frontier = []
+            for cell in frontier:
+                if cell == goal:
+                    path = []
+                    while cell != start:
+                        path.append(cell)
+                        cell = parent[cell]
+                    return path[::-1]
+                d = dist[cell] + 1
+                for i, j in NEIGHBORS:
+                    nx, ny = cell[0] + i, cell[1] + j
+                    if x0 <= nx < x1 and y0 <= ny < y1 and passable[nx - x0][ny - y0] and (nx, ny) not in dist:
+                        dist[(nx, ny)] = d
+                        parent[(nx, ny)] = cell
+                        next_frontier.append((nx, ny))
+            frontier = next_frontier
+        return None if goal is not None else dist
+
+    def build_edges(self, cluster):
+        """Kümedeki geçitler arası küme içi mesafeler."""
+        nodes = self.nodes[cluster]
+        edges = {}
+        for node in nodes:
+            dist = self.local_search(node, cluster)
+            edges[node] = [(other, dist[other]) for other in nodes if other != node and other in dist]
+        self.edges[cluster] = edges
+
+    # --- SORGU ---
+
+    def find_path(self, start, goal):
+        """
+        start -> goal yolu (başlangıç hariç, hedef dahil); yol yoksa [].
+        Aynı kümedeki hedef önce küme içinde aranır.
+        """
+        start, goal = tuple(start), tuple(goal)
+        if start == goal or not passable_mask(self.grid[goal], self.allow_unknown)[0]:
+            return []
+        self.refresh()
+
+        start_cluster, goal_cluster = self.cluster_of(start), self.cluster_of(goal)
+        if start_cluster == goal_cluster:
+            path = self.local_search(start, start_cluster, goal)
+            if path:
+                return path
+
+        # Başlangıç ve hedef, kendi kümelerinin geçitlerine geçici olarak bağlanır
+        start_dist = self.local_search(start, start_cluster)
+        start_edges = [(n, start_dist[n]) for n in self.nodes.get(start_cluster, ()) if n in start_dist]
+        goal_dist = self.local_search(goal, goal_cluster)
+        goal_edges = {n: goal_dist[n] for n in self.nodes.get(goal_cluster, ()) if n in goal_dist}
+
+        abstract = self.abstract_search(start, goal, start_edges, goal_edges)
+        if not abstract:
+            return []
+        return self.refine(abstract)
+
+    def abstract_search(self, start, goal, start_edges, goal_edges):
+        """Geçit grafiğinde A* (Manhattan); soyut düğüm listesi döner."""
+        g_score = {start: 0}
+        came_from = {}
+        oheap = [(heuristic(start, goal), start)]
+        closed = set()
+        while oheap:
+            current = heapq.heappop(oheap)[1]
+            if current == goal:
+                nodes = [goal]
+                while current in came_from:
+                    current = came_from[current]
+                    nodes.append(current)
+                return nodes[::-1]
+            if current in closed:
+                continue
+            closed.add(current)
+
+            if current == start:
+                neighbors = list(start_edges)
+            else:
+                neighbors = list(self.edges[self.cluster_of(current)].get(current, ()))
+            # Başlangıç karesi de bir geçit olabilir
+            neighbors += [(n, 1) for n in self.links.get(current, ())]
+            if current in goal_edges:
+                neighbors.append((goal, goal_edges[current]))
+
+            for neighbor, cost in neighbors:
+                tentative = g_score[current] + cost
+                if tentative < g_score.get(neighbor, float("inf")):
+                    g_score[neighbor] = tentative
+                    came_from[neighbor] = current
+                    heapq.heappush(oheap, (tentative + heuristic(neighbor, goal), neighbor))
+        return []
+
+    def refine(self, nodes):
+        """Soyut yolu kareye açar: Geçit geçişleri tek adım, küme içi parçalar yerel BFS."""
+        path = []
+        for a, b in zip(nodes, nodes[1:]):
+            if b in self.links.get(a, ()) and self.cluster_of(a) != self.cluster_of(b):
+                path.append(b)
+            else:
+                path += self.local_search(a, self.cluster_of(a), b)
+        return path
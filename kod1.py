@@ -1,8 +1,12 @@
 import pygame
 import math
 import numpy as np
-import heapq
 import random
+from navigation import ClickPlanner
+from plan_worker import PlanWorker
+from world import World
+from renderer import MapRenderer
+from map_io import save_map
 
 # --- AYARLAR ---
 WIDTH, HEIGHT = 800, 600
@@ -11,6 +15,14 @@ COLS, ROWS = WIDTH // GRID_SIZE, HEIGHT // GRID_SIZE
 ROBOT_RADIUS = 9 
 SENSING_RADIUS = 100
 
+# Tıklama navigasyonu planlayıcısı: "dstar" (yol önbellekli mesafe alanından
+# çıkarılır, yol kapanınca D* Lite ile artımlı onarılır) veya "hpa"
+# (hiyerarşik; yol kapanınca küme grafiği üzerinden yeniden planlanır)
+CLICK_PLANNER = "dstar"
+# Tıklama planları ve onarımları arka plandaki bir iş parçacığında, hafızanın
+# kopyası üzerinde hesaplanır; çizim ve giriş plan beklerken durmaz
+BACKGROUND_PLANNING = True
+
 # Durum Kodları (Matris için)
 VAL_UNKNOWN = 2  # Bilinmeyen
 VAL_FREE = 1     # Boş Alan
@@ -25,28 +37,34 @@ BLUE = (0, 0, 255)     # Yol
 GREEN = (0, 255, 0)    # Mesaj
 
 class Robot:
-    def __init__(self, x, y):
+    def __init__(self, x, y, world):
         self.x = x
         self.y = y
+        self.world = world
         self.angle = 0
         self.speed = 3
         self.path = []
+        self.target = None # Tıklanan hedef
 
-    def check_collision(self, new_x, new_y, grid):
-        grid_x = int(new_x // GRID_SIZE)
-        grid_y = int(new_y // GRID_SIZE)
+    def check_collision(self, new_x, new_y):
+        """Gerçek haritaya göre çarpışma kontrolü"""
+        grid_x, grid_y = self.world.cell_of(new_x, new_y)
 
-        if not (0 <= grid_x < COLS and 0 <= grid_y < ROWS):
+        if not self.world.in_bounds(grid_x, grid_y):
             return True 
-        if grid[grid_x][grid_y] == VAL_WALL:
+        if self.world.real_map[grid_x][grid_y] == VAL_WALL:
             return True 
         return False
 
-    def move(self, real_map):
+    def path_blocked(self, revealed):
+        """Sensörün açtığı duvarlardan biri yolun üzerinde mi?"""
+        xs, ys = revealed
+        wall = self.world.known_map[xs, ys] == VAL_WALL
+        return not set(zip(xs[wall].tolist(), ys[wall].tolist())).isdisjoint(self.path)
+
+    def move(self):
         if self.path:
-            target_node = self.path[0]
-            target_x = target_node[0] * GRID_SIZE + GRID_SIZE // 2
-            target_y = target_node[1] * GRID_SIZE + GRID_SIZE // 2
+            target_x, target_y = self.world.cell_center(self.path[0])
             
             dx = target_x - self.x
             dy = target_y - self.y
@@ -60,7 +78,7 @@ class Robot:
                 self.angle = math.atan2(dy, dx)
                 next_x = self.x + math.cos(self.angle) * self.speed
                 next_y = self.y + math.sin(self.angle) * self.speed
-                if not self.check_collision(next_x, next_y, real_map):
+                if not self.check_collision(next_x, next_y):
                     self.x = next_x
                     self.y = next_y
         else:
@@ -73,58 +91,26 @@ class Robot:
             if keys[pygame.K_UP]: new_y -= self.speed; moved = True
             if keys[pygame.K_DOWN]: new_y += self.speed; moved = True
 
-            if moved and not self.check_collision(new_x, new_y, real_map):
+            if moved and not self.check_collision(new_x, new_y):
                 self.x = new_x
                 self.y = new_y
 
-        self.x = max(ROBOT_RADIUS, min(WIDTH - ROBOT_RADIUS, self.x))
-        self.y = max(ROBOT_RADIUS, min(HEIGHT - ROBOT_RADIUS, self.y))
+        self.x = max(ROBOT_RADIUS, min(self.world.width - ROBOT_RADIUS, self.x))
+        self.y = max(ROBOT_RADIUS, min(self.world.height - ROBOT_RADIUS, self.y))
 
     def draw(self, win):
         pygame.draw.circle(win, RED, (int(self.x), int(self.y)), ROBOT_RADIUS)
         if self.path:
-            points = [(n[0]*GRID_SIZE + GRID_SIZE//2, n[1]*GRID_SIZE + GRID_SIZE//2) for n in self.path]
+            points = [self.world.cell_center(n) for n in self.path]
             if len(points) > 1:
                 pygame.draw.lines(win, BLUE, False, points, 3)
 
-def heuristic(a, b):
-    return abs(a[0] - b[0]) + abs(a[1] - b[1])
-
-def a_star_search(grid, start, goal):
-    neighbors = [(0, 1), (0, -1), (1, 0), (-1, 0)] 
-    close_set = set()
-    came_from = {}
-    g_score = {start: 0}
-    f_score = {start: heuristic(start, goal)}
-    oheap = []
-    heapq.heappush(oheap, (f_score[start], start))
-
-    while oheap:
-        current = heapq.heappop(oheap)[1]
-        if current == goal:
-            data = []
-            while current in came_from:
-                data.append(current)
-                current = came_from[current]
-            return data[::-1]
-        close_set.add(current)
-        for i, j in neighbors:
-            neighbor = current[0] + i, current[1] + j
-            if 0 <= neighbor[0] < COLS and 0 <= neighbor[1] < ROWS:
-                if grid[neighbor[0]][neighbor[1]] != VAL_FREE: continue
-            else: continue
-            tentative_g_score = g_score[current] + 1
-            if neighbor in close_set and tentative_g_score >= g_score.get(neighbor, 0): continue
-            if tentative_g_score < g_score.get(neighbor, float('inf')) or neighbor not in [i[1] for i in oheap]:
-                came_from[neighbor] = current
-                g_score[neighbor] = tentative_g_score
-                f_score[neighbor] = tentative_g_score + heuristic(neighbor, goal)
-                heapq.heappush(oheap, (f_score[neighbor], neighbor))
-    return []
-
-def generate_island_map(cols, rows):
-    """Büyük adacıklı harita oluşturur"""
-    grid = np.ones((cols, rows)) * VAL_FREE 
+def generate_island_map(cols, rows, rng=random, num_islands=7):
+    """
+    Büyük adacıklı harita oluşturur.
+    rng: random modülü veya tekrarlanabilir harita için random.Random(seed)
+    """
+    grid = np.full((cols, rows), VAL_FREE, dtype=np.uint8)
     
     # Çerçeve
     grid[0:cols, 0] = VAL_WALL
@@ -132,32 +118,22 @@ def generate_island_map(cols, rows):
     grid[0, 0:rows] = VAL_WALL
     grid[cols-1, 0:rows] = VAL_WALL
 
-    num_islands = 7
     for _ in range(num_islands):
-        w = random.randint(5, 12) 
-        h = random.randint(5, 12)
-        x = random.randint(3, cols - 15)
-        y = random.randint(3, rows - 15)
+        w = rng.randint(5, 12) 
+        h = rng.randint(5, 12)
+        x = rng.randint(3, cols - 15)
+        y = rng.randint(3, rows - 15)
         
         if x < 10 and y < 10: continue
         grid[x:x+w, y:y+h] = VAL_WALL
 
     return grid
 
-def save_scanned_matrix(grid, filename="taranan_alan.txt"):
-    """Sadece robotun 'known_map' matrisini kaydeder."""
-    cols = len(grid)
-    rows = len(grid[0])
-    
-    with open(filename, "w") as f:
-        f.write(f"# Harita Boyutu: {cols}x{rows}\n")
-        f.write("# 2: Bilinmeyen, 1: Boş, 0: Duvar\n")
-        for y in range(rows):
-            line = []
-            for x in range(cols):
-                val = int(grid[x][y])
-                line.append(str(val))
-            f.write(" ".join(line) + "\n")
+def save_scanned_matrix(grid, filename="taranan_alan.txt", metadata=None):
+    """Sadece robotun 'known_map' matrisini kaydeder (.rsm uzantısında ikili dosya)."""
+    cols, rows = grid.shape
+    header = [f"# Harita Boyutu: {cols}x{rows}", "# 2: Bilinmeyen, 1: Boş, 0: Duvar"]
+    save_map(grid, filename, header, metadata)
     
     print(f"TARANAN matris kaydedildi: {filename}")
 
@@ -168,12 +144,30 @@ def main():
     clock = pygame.time.Clock()
     font = pygame.font.SysFont("Arial", 20)
 
-    # Gerçek Harita
-    real_world_map = generate_island_map(COLS, ROWS)
-    # Robotun Hafızası
-    known_map = np.full((COLS, ROWS), VAL_UNKNOWN) 
+    # Dünya: Gerçek Harita + Robotun Hafızası
+    world = World(generate_island_map(COLS, ROWS), GRID_SIZE)
+    known_map = world.known_map
+
+    # Kalıcı harita yüzeyi (Bilinmeyen ve Duvar siyah, Boş alan gri + ızgara)
+    renderer = MapRenderer(known_map, world.cell_size, {VAL_UNKNOWN: BLACK, VAL_FREE: GRAY, VAL_WALL: BLACK}, WHITE)
 
-    robot = Robot(50, 50)
+    robot = Robot(50, 50, world)
+
+    # Bilinmeyen alana da gidilebilir; yol, görülen duvarlara göre onarılır
+    click_planner = ClickPlanner(known_map.shape, CLICK_PLANNER, allow_unknown=True)
+    worker = PlanWorker() if BACKGROUND_PLANNING else None
+    pending = None # Arka planda beklenen iş: (click_planner.plan / repair, yol yoksa mesajı)
+
+    def request_path(job, retry=False):
+        """
+        Robotun karesinden robot.target'a planı (job), hafızanın kopyasıyla
+        arka plana gönderir. Yeni tıklama ve onarım bekleyen eski planı
+        geçersiz kılar; retry (eskiyen sonucun yeniden istenmesi) ise biten
+        bir planı atmaz.
+        """
+        start = world.cell_of(robot.x, robot.y)
+        submit = worker.try_submit if retry else worker.submit
+        submit(world.version, job, known_map.copy(), world.version, start, robot.target)
 
     running = True
     while running:
@@ -187,71 +181,89 @@ def main():
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_s:
                     save_scanned_matrix(known_map, "taranan_alan.txt")
+                # İkili Kayıt (B)
+                if event.key == pygame.K_b:
+                    save_scanned_matrix(known_map, "taranan_alan.rsm", {"robot": [robot.x, robot.y]})
 
             # Navigasyon
             if event.type == pygame.MOUSEBUTTONDOWN:
                 m_x, m_y = pygame.mouse.get_pos()
-                target_grid = (m_x // GRID_SIZE, m_y // GRID_SIZE)
-                start_grid = (int(robot.x) // GRID_SIZE, int(robot.y) // GRID_SIZE)
+                target_grid = world.cell_of(m_x, m_y)
                 
-                if 0 <= target_grid[0] < COLS and 0 <= target_grid[1] < ROWS:
-                    if known_map[target_grid[0]][target_grid[1]] == VAL_FREE:
+                if world.in_bounds(*target_grid):
+                    if known_map[target_grid[0]][target_grid[1]] != VAL_WALL:
                         print("Rota hesaplanıyor...")
-                        path = a_star_search(known_map, start_grid, target_grid)
-                        if path: robot.path = path
-                        else: print("Yol yok.")
+                        robot.target = target_grid
+                        if worker:
+                            # Robot, plan gelene kadar olduğu yerde bekler
+                            robot.path = []
+                            pending = (click_planner.plan, "Yol yok.")
+                            request_path(click_planner.plan)
+                        else:
+                            start_grid = world.cell_of(robot.x, robot.y)
+                            robot.path = click_planner.plan(known_map, world.version, start_grid, target_grid)
+                            if not robot.path: print("Yol yok.")
                     else:
-                        print("Hedef bilinmiyor veya duvar.")
+                        print("Hedef duvar.")
+
+        # Arka plan planı hazırsa alınır. Bu arada harita değiştiyse (sürüm
+        # farklı) sonuç atılır ve güncel hafızayla yeniden istenir.
+        done = worker.poll() if worker else None
+        if done and pending:
+            version, path = done
+            job, message = pending
+            if version != world.version:
+                request_path(job, retry=True)
+            else:
+                robot.path = path
+                pending = None
+                if not path: print(message)
 
-        robot.move(real_world_map)
+        robot.move()
 
         # Haritalama (Sensör)
-        r_grid_x = int(robot.x) // GRID_SIZE
-        r_grid_y = int(robot.y) // GRID_SIZE
+        r_grid_x, r_grid_y = world.cell_of(robot.x, robot.y)
         view_range = 4
-        for i in range(-view_range, view_range + 1):
-            for j in range(-view_range, view_range + 1):
-                nx, ny = r_grid_x + i, r_grid_y + j
-                if 0 <= nx < COLS and 0 <= ny < ROWS:
-                    known_map[nx][ny] = real_world_map[nx][ny]
+        revealed = world.sense(r_grid_x, r_grid_y, view_range)
+        renderer.update(known_map, revealed)
+
+        # Yolun üzerinde duvar görüldüyse yol onarılır ("dstar": D* Lite ilk
+        # onarımda kurulur, sonrakiler sadece değişen kareleri işler)
+        if robot.path and robot.path_blocked(revealed):
+            cell = world.cell_of(robot.x, robot.y)
+            if cell == robot.target:
+                robot.path = [cell] # Hedef karesindeyiz, merkezine gidilir
+            elif worker:
+                # Kapanan yol bırakılır; robot onarılan yol gelene kadar bekler
+                robot.path = []
+                pending = (click_planner.repair, "Yol kapandı.")
+                request_path(click_planner.repair)
+            else:
+                robot.path = click_planner.repair(known_map, world.version, cell, robot.target)
+                if not robot.path: print("Yol kapandı.")
 
         # --- ÇİZİM ---
-        win.fill(BLACK) # Arka plan (Bilinmeyen = Siyah)
-        
-        for x in range(COLS):
-            for y in range(ROWS):
-                rect = (x * GRID_SIZE, y * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-                val = known_map[x][y]
-                
-                # 1. Boş Alanları Çiz (Gri)
-                if val == VAL_FREE: 
-                    pygame.draw.rect(win, GRAY, rect)
-                    pygame.draw.rect(win, WHITE, rect, 1) # Izgara çizgisi
-                
-                # 2. Duvarları Çiz (SİYAH - Arka planla aynı)
-                elif val == VAL_WALL:
-                    # Zaten arka plan siyah olduğu için rect fill yapmaya gerek yok,
-                    # ama kodun okunabilirliği için açıkça siyah basıyoruz.
-                    pygame.draw.rect(win, BLACK, rect)
-                    
-                    # 3. MENZİL GÖSTERİMİ (Önemli Kısım)
-                    # Eğer bu duvar robotun sensör menzilindeyse, üstüne kırmızı çerçeve çiz.
-                    # Bu sayede engel siyah kalır ama robotun onu gördüğü belli olur.
-                    dist_x = abs(x - r_grid_x)
-                    dist_y = abs(y - r_grid_y)
-                    
-                    if real_world_map[x][y] == VAL_WALL: # Gerçekten duvar mı?
-                        if dist_x <= view_range and dist_y <= view_range:
-                             # Engelin üzerine Kırmızı Kenarlık Çiz (İçi boş, sadece çerçeve)
-                             pygame.draw.rect(win, RED, rect, 1)
+        # Sadece değişen kareler yeniden boyanır, yüzey tek seferde basılır
+        renderer.draw(win)
+
+        # MENZİL GÖSTERİMİ (Önemli Kısım)
+        # Robotun sensör menzilindeki duvarların üstüne kırmızı çerçeve çiz.
+        # Bu sayede engel siyah kalır ama robotun onu gördüğü belli olur.
+        x0, y0 = max(r_grid_x - view_range, 0), max(r_grid_y - view_range, 0)
+        wall_x, wall_y = np.nonzero(known_map[x0:r_grid_x + view_range + 1, y0:r_grid_y + view_range + 1] == VAL_WALL)
+        for x, y in zip(wall_x + x0, wall_y + y0):
+            c = world.cell_size
+            pygame.draw.rect(win, RED, (x * c, y * c, c, c), 1)
 
         robot.draw(win)
         
-        text = font.render("'S' tuşu: Matris Kaydet", True, GREEN)
+        text = font.render("'S' tuşu: Matris Kaydet  'B' tuşu: İkili Kaydet", True, GREEN)
         win.blit(text, (10, 10))
         
         pygame.display.update()
 
+    if worker:
+        worker.stop()
     pygame.quit()
 
 if __name__ == "__main__":
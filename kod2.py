@@ -1,8 +1,13 @@
 import pygame
 import math
 import numpy as np
-import heapq
 import random
+from navigation import ClickPlanner
+from plan_worker import PlanWorker
+from world import World
+from renderer import MapRenderer
+from map_io import save_map
+from sim_clock import SimClock
 
 # --- AYARLAR ---
 WIDTH, HEIGHT = 800, 600
@@ -10,6 +15,18 @@ GRID_SIZE = 20
 COLS, ROWS = WIDTH // GRID_SIZE, HEIGHT // GRID_SIZE
 ROBOT_RADIUS = 10
 
+# Tıklama navigasyonu planlayıcısı: "field" (robotun karesinden önbellekli
+# mesafe alanı; robot ve harita değişmedikçe her tıklama arama yapmadan
+# yanıtlanır), "astar" (düz A*), "jps" (Jump Point Search, aynı maliyetli
+# yol, daha az açılan kare) veya "hpa" (hiyerarşik, büyük haritalarda sadece
+# sensörün değiştirdiği kümeler yenilenir)
+CLICK_PLANNER = "field"
+# astar / jps: Çapraz adımlara izin ver (8 komşuluk, köşe kesilmez)
+CLICK_DIAGONAL = False
+# Tıklama planları arka plandaki bir iş parçacığında, hafızanın kopyası
+# üzerinde hesaplanır; çizim ve giriş plan beklerken durmaz
+BACKGROUND_PLANNING = True
+
 # Renkler
 UNKNOWN_COLOR = (240, 230, 140) 
 FREE_COLOR = (200, 200, 200)    
@@ -24,15 +41,16 @@ VAL_FREE = 1
 VAL_WALL = 0
 
 class Robot:
-    def __init__(self, x, y):
+    def __init__(self, x, y, world):
         self.x = x
         self.y = y
+        self.world = world
         self.angle = random.uniform(0, 2 * math.pi)
         self.speed = 8 # Hızı biraz daha artırdım, daha çabuk bitirsin diye
         self.path = []
         self.mode = "EXPLORE"
 
-    def auto_explore(self, grid):
+    def auto_explore(self):
         """Kusurlu Sekme Mantığı (Rastgele Sapmalı)"""
         
         dx = math.cos(self.angle) * self.speed
@@ -41,18 +59,20 @@ class Robot:
         next_x = self.x + dx
         next_y = self.y + dy
 
-        next_grid_x = int(np.clip(next_x // GRID_SIZE, 0, COLS - 1))
-        next_grid_y = int(np.clip(next_y // GRID_SIZE, 0, ROWS - 1))
-        curr_grid_y = int(np.clip(self.y // GRID_SIZE, 0, ROWS - 1))
+        world = self.world
+        grid = world.real_map
+        next_grid_x = int(np.clip(next_x // world.cell_size, 0, world.cols - 1))
+        next_grid_y = int(np.clip(next_y // world.cell_size, 0, world.rows - 1))
+        curr_grid_y = int(np.clip(self.y // world.cell_size, 0, world.rows - 1))
 
         hit = False
 
         # --- SINIRLARA ÇARPMA ---
-        if next_x - ROBOT_RADIUS < 0 or next_x + ROBOT_RADIUS > WIDTH:
+        if next_x - ROBOT_RADIUS < 0 or next_x + ROBOT_RADIUS > world.width:
             dx = -dx
             hit = True
         
-        if next_y - ROBOT_RADIUS < 0 or next_y + ROBOT_RADIUS > HEIGHT:
+        if next_y - ROBOT_RADIUS < 0 or next_y + ROBOT_RADIUS > world.height:
             dy = -dy
             hit = True
 
@@ -60,9 +80,9 @@ class Robot:
         if not hit:
             if grid[next_grid_x][next_grid_y] == VAL_WALL:
                 hit = True
-                check_x = int((self.x + dx) // GRID_SIZE)
+                check_x = int((self.x + dx) // world.cell_size)
                 # Yan duvara mı çarptı?
-                if 0 <= check_x < COLS and grid[check_x][curr_grid_y] == VAL_WALL:
+                if 0 <= check_x < world.cols and grid[check_x][curr_grid_y] == VAL_WALL:
                     dx = -dx
                 else:
                     dy = -dy 
@@ -84,14 +104,12 @@ class Robot:
         self.y += math.sin(self.angle) * self.speed
 
         # Sınırların içinde kal
-        self.x = max(ROBOT_RADIUS, min(WIDTH - ROBOT_RADIUS, self.x))
-        self.y = max(ROBOT_RADIUS, min(HEIGHT - ROBOT_RADIUS, self.y))
+        self.x = max(ROBOT_RADIUS, min(world.width - ROBOT_RADIUS, self.x))
+        self.y = max(ROBOT_RADIUS, min(world.height - ROBOT_RADIUS, self.y))
 
     def navigate(self):
         if self.path:
-            target_node = self.path[0]
-            target_x = target_node[0] * GRID_SIZE + GRID_SIZE // 2
-            target_y = target_node[1] * GRID_SIZE + GRID_SIZE // 2
+            target_x, target_y = self.world.cell_center(self.path[0])
             
             dx = target_x - self.x
             dy = target_y - self.y
@@ -111,76 +129,30 @@ class Robot:
     def draw(self, win):
         pygame.draw.circle(win, ROBOT_COLOR, (int(self.x), int(self.y)), ROBOT_RADIUS)
         if self.path:
-            points = [(n[0]*GRID_SIZE + GRID_SIZE//2, n[1]*GRID_SIZE + GRID_SIZE//2) for n in self.path]
+            points = [self.world.cell_center(n) for n in self.path]
             if len(points) > 1:
                 pygame.draw.lines(win, PATH_COLOR, False, points, 3)
 
 # --- YENİ EKLENEN FONKSİYON: MATRİS KAYDETME ---
-def save_map_matrix(grid, filename="otomatik_harita.txt"):
-    """Haritayı metin dosyası olarak kaydeder"""
-    cols = len(grid)
-    rows = len(grid[0])
-    
+def save_map_matrix(grid, filename="otomatik_harita.txt", metadata=None):
+    """Haritayı metin dosyası (.rsm uzantısında ikili dosya) olarak kaydeder"""
     try:
-        with open(filename, "w") as f:
-            # Görsel olarak doğru olması için satır satır (y) okuyup yazıyoruz
-            for y in range(rows):
-                line = []
-                for x in range(cols):
-                    line.append(str(int(grid[x][y])))
-                f.write(" ".join(line) + "\n")
+        # Görsel olarak doğru olması için satır satır (y) yazılır
+        save_map(grid, filename, metadata=metadata)
         print(f"Harita matrisi başarıyla kaydedildi: {filename}")
     except Exception as e:
         print(f"Dosya kaydedilirken hata oluştu: {e}")
 
-# A* ve Yardımcı Fonksiyonlar
-def heuristic(a, b):
-    return abs(a[0] - b[0]) + abs(a[1] - b[1])
-
-def a_star_search(grid, start, goal):
-    neighbors = [(0, 1), (0, -1), (1, 0), (-1, 0)]
-    close_set = set()
-    came_from = {}
-    g_score = {start: 0}
-    f_score = {start: heuristic(start, goal)}
-    oheap = []
-    heapq.heappush(oheap, (f_score[start], start))
-
-    while oheap:
-        current = heapq.heappop(oheap)[1]
-        if current == goal:
-            data = []
-            while current in came_from:
-                data.append(current)
-                current = came_from[current]
-            return data[::-1]
-        close_set.add(current)
-        for i, j in neighbors:
-            neighbor = current[0] + i, current[1] + j
-            if 0 <= neighbor[0] < COLS and 0 <= neighbor[1] < ROWS:
-                if grid[neighbor[0]][neighbor[1]] != VAL_FREE:
-                    continue
-            else:
-                continue
-            tentative_g_score = g_score[current] + 1
-            if neighbor in close_set and tentative_g_score >= g_score.get(neighbor, 0):
-                continue
-            if tentative_g_score < g_score.get(neighbor, float('inf')) or neighbor not in [i[1] for i in oheap]:
-                came_from[neighbor] = current
-                g_score[neighbor] = tentative_g_score
-                f_score[neighbor] = tentative_g_score + heuristic(neighbor, goal)
-                heapq.heappush(oheap, (f_score[neighbor], neighbor))
-    return []
-
 def main():
     pygame.init()
     win = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Seken Robot Simülasyonu")
-    clock = pygame.time.Clock()
+    sim = SimClock(fps=60)
     font = pygame.font.SysFont("Arial", 30, bold=True)
+    small_font = pygame.font.SysFont("Arial", 16, bold=True)
 
     # Harita
-    real_world_map = np.ones((COLS, ROWS), dtype=int) * VAL_FREE 
+    real_world_map = np.full((COLS, ROWS), VAL_FREE, dtype=np.uint8)
     # Duvarlar
     real_world_map[10:15, 10:20] = VAL_WALL
     real_world_map[25:30, 5:15] = VAL_WALL
@@ -188,76 +160,104 @@ def main():
     real_world_map[2:5, 2:5] = VAL_WALL
     real_world_map[35:38, 3:6] = VAL_WALL
 
-    known_map = np.full((COLS, ROWS), VAL_UNKNOWN, dtype=int)
+    world = World(real_world_map, GRID_SIZE)
+    known_map = world.known_map
+    renderer = MapRenderer(known_map, world.cell_size, {VAL_UNKNOWN: UNKNOWN_COLOR, VAL_FREE: FREE_COLOR, VAL_WALL: WALL_COLOR})
 
-    robot = Robot(50, 50)
+    robot = Robot(50, 50, world)
+
+    click_planner = ClickPlanner(known_map.shape, CLICK_PLANNER, CLICK_DIAGONAL)
+    worker = PlanWorker() if BACKGROUND_PLANNING else None
+    click_target = None # Arka planda planlanan tıklama hedefi
+
+    def request_path(target, retry=False):
+        """
+        Robotun karesinden target'a planı, hafızanın kopyasıyla arka plana
+        gönderir. Yeni tıklama bekleyen eski planı geçersiz kılar; retry
+        (eskiyen sonucun yeniden istenmesi) ise biten bir planı atmaz.
+        """
+        start = world.cell_of(robot.x, robot.y)
+        submit = worker.try_submit if retry else worker.submit
+        submit(world.version, click_planner.plan, known_map.copy(), world.version, start, target)
     
     # %100 Keşif (Not: Rastgele hareketle %100 yapmak bazen çok uzun sürer, 
     # bu yüzden robot inatçı bir şekilde sekecektir)
+    # Duvarların içi gibi hiçbir konumdan görülemeyen kareler beklenmez:
+    # ulaşılabilir bölgeden görülebilen her yer görülünce de biter.
     EXPLORATION_GOAL = 0.99 + 0.01
+    view_range = 4
 
     running = True
     while running:
-        clock.tick(60) # 60 FPS
+        sim.tick() # 60 FPS (Çizim)
         
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
+
+            # +/-: Simülasyon hızı (Kare başına adım)
+            sim.handle_event(event)
+
+            # B: İkili Kayıt
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_b:
+                save_map_matrix(known_map, "otomatik_harita.rsm", {"robot": [robot.x, robot.y]})
             
             if robot.mode == "WAITING" and event.type == pygame.MOUSEBUTTONDOWN:
                 m_x, m_y = pygame.mouse.get_pos()
-                target_grid = (m_x // GRID_SIZE, m_y // GRID_SIZE)
-                start_grid = (int(robot.x) // GRID_SIZE, int(robot.y) // GRID_SIZE)
+                target_grid = world.cell_of(m_x, m_y)
+                start_grid = world.cell_of(robot.x, robot.y)
                 
                 if known_map[target_grid[0]][target_grid[1]] == VAL_FREE:
-                    path = a_star_search(known_map, start_grid, target_grid)
-                    if path:
-                        robot.path = path
-                        robot.mode = "NAVIGATE"
-
-        # --- DURUM MAKİNESİ ---
-        if robot.mode == "EXPLORE":
-            robot.auto_explore(real_world_map)
-            
-            unknown_cells = np.count_nonzero(known_map == VAL_UNKNOWN)
-            explored_ratio = 1 - (unknown_cells / (COLS * ROWS))
+                    if worker:
+                        # Robot, plan gelene kadar olduğu yerde bekler
+                        click_target = target_grid
+                        request_path(target_grid)
+                    else:
+                        path = click_planner.plan(known_map, world.version, start_grid, target_grid)
+                        if path:
+                            robot.path = path
+                            robot.mode = "NAVIGATE"
+
+        # Arka plan planı hazırsa alınır. Bu arada harita değiştiyse (sürüm
+        # farklı) sonuç eskimiştir: Atılır ve hedef güncel hafızayla yeniden planlanır.
+        done = worker.poll() if worker else None
+        if done and click_target and robot.mode == "WAITING":
+            version, path = done
+            if version != world.version:
+                request_path(click_target, retry=True)
+            elif path:
+                robot.path = path
+                robot.mode = "NAVIGATE"
+
+        # --- SİMÜLASYON ADIMLARI (Kare başına K adım) ---
+        for _ in sim.steps():
+            # --- DURUM MAKİNESİ ---
+            if robot.mode == "EXPLORE":
+                robot.auto_explore()
+                
+                # GÜNCELLENMİŞ KISIM: Hedefe ulaşınca OTOMATİK KAYIT
+                if world.exploration_finished(world.cell_of(robot.x, robot.y), view_range, EXPLORATION_GOAL):
+                    print("Hedef orana ulaşıldı. Harita kaydediliyor...")
+                    save_map_matrix(known_map, "otomatik_harita.txt")
+                    robot.mode = "WAITING"
             
-            # GÜNCELLENMİŞ KISIM: Hedefe ulaşınca OTOMATİK KAYIT
-            if explored_ratio >= EXPLORATION_GOAL:
-                print("Hedef orana ulaşıldı. Harita kaydediliyor...")
-                save_map_matrix(known_map, "otomatik_harita.txt")
-                robot.mode = "WAITING"
-        
-        elif robot.mode == "NAVIGATE":
-            robot.navigate()
-            if not robot.path:
-                robot.mode = "WAITING"
-
-        # --- SENSÖR ---
-        r_grid_x = int(robot.x) // GRID_SIZE
-        r_grid_y = int(robot.y) // GRID_SIZE
-        view_range = 4
-        for i in range(-view_range, view_range + 1):
-            for j in range(-view_range, view_range + 1):
-                nx, ny = r_grid_x + i, r_grid_y + j
-                if 0 <= nx < COLS and 0 <= ny < ROWS:
-                    known_map[nx][ny] = real_world_map[nx][ny]
+            elif robot.mode == "NAVIGATE":
+                robot.navigate()
+                if not robot.path:
+                    robot.mode = "WAITING"
 
-        # --- ÇİZİM ---
-        win.fill((0, 0, 0))
-        for x in range(COLS):
-            for y in range(ROWS):
-                rect = (x * GRID_SIZE, y * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-                cell_val = known_map[x][y]
-                if cell_val == VAL_UNKNOWN:
-                    pygame.draw.rect(win, UNKNOWN_COLOR, rect)
-                elif cell_val == VAL_FREE:
-                    pygame.draw.rect(win, FREE_COLOR, rect)
-                    pygame.draw.rect(win, (255,255,255), rect, 1)
-                elif cell_val == VAL_WALL:
-                    pygame.draw.rect(win, WALL_COLOR, rect)
+            # --- SENSÖR ---
+            r_grid_x, r_grid_y = world.cell_of(robot.x, robot.y)
+            revealed = world.sense(r_grid_x, r_grid_y, view_range)
+            renderer.mark(revealed)
 
+        # --- ÇİZİM ---
+        renderer.flush(known_map)
+        renderer.draw(win)
         robot.draw(win)
+
+        speed_surf = small_font.render(sim.label(), True, TEXT_COLOR)
+        win.blit(speed_surf, (10, HEIGHT - 25))
         
         if robot.mode == "WAITING":
             text_surf = font.render("KEŞİF BİTTİ - HARİTA KAYDEDİLDİ", True, TEXT_COLOR)
@@ -273,6 +273,8 @@ def main():
 
         pygame.display.update()
 
+    if worker:
+        worker.stop()
     pygame.quit()
 
 if __name__ == "__main__":
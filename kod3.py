@@ -1,8 +1,13 @@
 import pygame
 import math
 import numpy as np
-import heapq
 import random
+from navigation import ClickPlanner
+from plan_worker import PlanWorker
+from world import World
+from renderer import MapRenderer
+from map_io import save_map
+from sim_clock import SimClock
 
 # --- AYARLAR ---
 WIDTH, HEIGHT = 800, 600
@@ -11,7 +16,22 @@ COLS, ROWS = WIDTH // GRID_SIZE, HEIGHT // GRID_SIZE
 ROBOT_RADIUS = 10
 
 # Hedef Keşif Oranı (%100 taranınca işlem biter)
+# Duvarların içi gibi hiçbir konumdan görülemeyen kareler beklenmez;
+# robotun ulaşabildiği bölgeden görülebilen her yer görülünce de biter.
 EXPLORATION_GOAL = 0.96 + 0.04
+VIEW_RANGE = 5
+
+# Tıklama navigasyonu planlayıcısı: "field" (robotun karesinden önbellekli
+# mesafe alanı; robot ve harita değişmedikçe her tıklama arama yapmadan
+# yanıtlanır), "astar" (düz A*), "jps" (Jump Point Search, aynı maliyetli
+# yol, daha az açılan kare) veya "hpa" (hiyerarşik, büyük haritalarda sadece
+# sensörün değiştirdiği kümeler yenilenir)
+CLICK_PLANNER = "field"
+# astar / jps: Çapraz adımlara izin ver (8 komşuluk, köşe kesilmez)
+CLICK_DIAGONAL = False
+# Tıklama planları arka plandaki bir iş parçacığında, hafızanın kopyası
+# üzerinde hesaplanır; çizim ve giriş plan beklerken durmaz
+BACKGROUND_PLANNING = True
 
 # Renkler
 UNKNOWN_COLOR = (240, 230, 140) 
@@ -28,15 +48,16 @@ VAL_FREE = 1
 VAL_WALL = 0
 
 class Robot:
-    def __init__(self, x, y):
+    def __init__(self, x, y, world):
         self.x = x
         self.y = y
+        self.world = world
         self.angle = random.uniform(0, 2 * math.pi)
         self.speed = 8 
         self.path = []
         self.mode = "EXPLORE" # Modlar: EXPLORE, PAUSED, NAVIGATE, FINISHED
 
-    def auto_explore(self, grid):
+    def auto_explore(self):
         """Kusurlu Sekme Mantığı"""
         dx = math.cos(self.angle) * self.speed
         dy = math.sin(self.angle) * self.speed
@@ -44,17 +65,19 @@ class Robot:
         next_x = self.x + dx
         next_y = self.y + dy
 
-        next_grid_x = int(np.clip(next_x // GRID_SIZE, 0, COLS - 1))
-        next_grid_y = int(np.clip(next_y // GRID_SIZE, 0, ROWS - 1))
-        curr_grid_y = int(np.clip(self.y // GRID_SIZE, 0, ROWS - 1))
+        world = self.world
+        grid = world.real_map
+        next_grid_x = int(np.clip(next_x // world.cell_size, 0, world.cols - 1))
+        next_grid_y = int(np.clip(next_y // world.cell_size, 0, world.rows - 1))
+        curr_grid_y = int(np.clip(self.y // world.cell_size, 0, world.rows - 1))
 
         hit = False
 
         # Sınır Kontrolü
-        if next_x - ROBOT_RADIUS < 0 or next_x + ROBOT_RADIUS > WIDTH:
+        if next_x - ROBOT_RADIUS < 0 or next_x + ROBOT_RADIUS > world.width:
             dx = -dx
             hit = True
-        if next_y - ROBOT_RADIUS < 0 or next_y + ROBOT_RADIUS > HEIGHT:
+        if next_y - ROBOT_RADIUS < 0 or next_y + ROBOT_RADIUS > world.height:
             dy = -dy
             hit = True
 
@@ -62,8 +85,8 @@ class Robot:
         if not hit:
             if grid[next_grid_x][next_grid_y] == VAL_WALL:
                 hit = True
-                check_x = int((self.x + dx) // GRID_SIZE)
-                if 0 <= check_x < COLS and grid[check_x][curr_grid_y] == VAL_WALL:
+                check_x = int((self.x + dx) // world.cell_size)
+                if 0 <= check_x < world.cols and grid[check_x][curr_grid_y] == VAL_WALL:
                     dx = -dx
                 else:
                     dy = -dy 
@@ -78,14 +101,12 @@ class Robot:
 
         self.x += math.cos(self.angle) * self.speed
         self.y += math.sin(self.angle) * self.speed
-        self.x = max(ROBOT_RADIUS, min(WIDTH - ROBOT_RADIUS, self.x))
-        self.y = max(ROBOT_RADIUS, min(HEIGHT - ROBOT_RADIUS, self.y))
+        self.x = max(ROBOT_RADIUS, min(world.width - ROBOT_RADIUS, self.x))
+        self.y = max(ROBOT_RADIUS, min(world.height - ROBOT_RADIUS, self.y))
 
     def navigate(self):
         if self.path:
-            target_node = self.path[0]
-            target_x = target_node[0] * GRID_SIZE + GRID_SIZE // 2
-            target_y = target_node[1] * GRID_SIZE + GRID_SIZE // 2
+            target_x, target_y = self.world.cell_center(self.path[0])
             
             dx = target_x - self.x
             dy = target_y - self.y
@@ -108,58 +129,13 @@ class Robot:
     def draw(self, win):
         pygame.draw.circle(win, ROBOT_COLOR, (int(self.x), int(self.y)), ROBOT_RADIUS)
         if self.path:
-            points = [(n[0]*GRID_SIZE + GRID_SIZE//2, n[1]*GRID_SIZE + GRID_SIZE//2) for n in self.path]
+            points = [self.world.cell_center(n) for n in self.path]
             if len(points) > 1:
                 pygame.draw.lines(win, PATH_COLOR, False, points, 3)
 
-def heuristic(a, b):
-    return abs(a[0] - b[0]) + abs(a[1] - b[1])
-
-def a_star_search(grid, start, goal):
-    neighbors = [(0, 1), (0, -1), (1, 0), (-1, 0)]
-    close_set = set()
-    came_from = {}
-    g_score = {start: 0}
-    f_score = {start: heuristic(start, goal)}
-    oheap = []
-    heapq.heappush(oheap, (f_score[start], start))
-
-    while oheap:
-        current = heapq.heappop(oheap)[1]
-        if current == goal:
-            data = []
-            while current in came_from:
-                data.append(current)
-                current = came_from[current]
-            return data[::-1]
-        close_set.add(current)
-        for i, j in neighbors:
-            neighbor = current[0] + i, current[1] + j
-            if 0 <= neighbor[0] < COLS and 0 <= neighbor[1] < ROWS:
-                if grid[neighbor[0]][neighbor[1]] != VAL_FREE:
-                    continue
-            else:
-                continue
-            tentative_g_score = g_score[current] + 1
-            if neighbor in close_set and tentative_g_score >= g_score.get(neighbor, 0):
-                continue
-            if tentative_g_score < g_score.get(neighbor, float('inf')) or neighbor not in [i[1] for i in oheap]:
-                came_from[neighbor] = current
-                g_score[neighbor] = tentative_g_score
-                f_score[neighbor] = tentative_g_score + heuristic(neighbor, goal)
-                heapq.heappush(oheap, (f_score[neighbor], neighbor))
-    return []
-
-def save_map_matrix(grid, filename):
-    rows = len(grid[0])
-    cols = len(grid)
+def save_map_matrix(grid, filename, metadata=None):
     try:
-        with open(filename, "w") as f:
-            for y in range(rows):
-                line = []
-                for x in range(cols):
-                    line.append(str(int(grid[x][y])))
-                f.write(" ".join(line) + "\n")
+        save_map(grid, filename, metadata=metadata)
         print(f"Harita başarıyla kaydedildi: {filename}")
     except Exception as e:
         print(f"Kaydetme hatası: {e}")
@@ -168,31 +144,50 @@ def main():
     pygame.init()
     win = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Robot Haritalama")
-    clock = pygame.time.Clock()
+    sim = SimClock(fps=60)
     
     font = pygame.font.SysFont("Arial", 20, bold=True)
     font_msg = pygame.font.SysFont("Arial", 32, bold=True)
 
     # Harita
-    real_world_map = np.ones((COLS, ROWS), dtype=int) * VAL_FREE 
+    real_world_map = np.full((COLS, ROWS), VAL_FREE, dtype=np.uint8)
     real_world_map[10:15, 10:20] = VAL_WALL
     real_world_map[25:30, 5:15] = VAL_WALL
     real_world_map[5:35, 25:26] = VAL_WALL
     real_world_map[2:5, 2:5] = VAL_WALL 
 
     # Robotun Hafızası
-    known_map = np.full((COLS, ROWS), VAL_UNKNOWN, dtype=int)
-    robot = Robot(50, 50)
+    world = World(real_world_map, GRID_SIZE)
+    known_map = world.known_map
+    renderer = MapRenderer(known_map, world.cell_size, {VAL_UNKNOWN: UNKNOWN_COLOR, VAL_FREE: FREE_COLOR, VAL_WALL: WALL_COLOR})
+    robot = Robot(50, 50, world)
+
+    click_planner = ClickPlanner(known_map.shape, CLICK_PLANNER, CLICK_DIAGONAL)
+    worker = PlanWorker() if BACKGROUND_PLANNING else None
+    click_target = None # Arka planda planlanan tıklama hedefi
+
+    def request_path(target, retry=False):
+        """
+        Robotun karesinden target'a planı, hafızanın kopyasıyla arka plana
+        gönderir. Yeni tıklama bekleyen eski planı geçersiz kılar; retry
+        (eskiyen sonucun yeniden istenmesi) ise biten bir planı atmaz.
+        """
+        start = world.cell_of(robot.x, robot.y)
+        submit = worker.try_submit if retry else worker.submit
+        submit(world.version, click_planner.plan, known_map.copy(), world.version, start, target)
     
     map_version = 1
 
     running = True
     while running:
-        clock.tick(60)
+        sim.tick()
         
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
+
+            # +/-: Simülasyon hızı (Kare başına adım)
+            sim.handle_event(event)
             
             if event.type == pygame.KEYDOWN:
                 # Q: Durdur / Devam Et
@@ -207,80 +202,82 @@ def main():
                     save_map_matrix(known_map, f"manuel_kayit_{map_version}.txt")
                     map_version += 1
 
+                # B: İkili Kayıt
+                if event.key == pygame.K_b:
+                    metadata = {"robot": [robot.x, robot.y], "version": map_version}
+                    save_map_matrix(known_map, f"manuel_kayit_{map_version}.rsm", metadata)
+                    map_version += 1
+
             # Fare Navigasyonu (Duraklatıldığında veya Bittiğinde çalışır)
             if (robot.mode == "PAUSED" or robot.mode == "FINISHED") and event.type == pygame.MOUSEBUTTONDOWN:
                 m_x, m_y = pygame.mouse.get_pos()
-                target_grid = (m_x // GRID_SIZE, m_y // GRID_SIZE)
-                start_grid = (int(robot.x) // GRID_SIZE, int(robot.y) // GRID_SIZE)
+                target_grid = world.cell_of(m_x, m_y)
+                start_grid = world.cell_of(robot.x, robot.y)
                 if known_map[target_grid[0]][target_grid[1]] == VAL_FREE:
-                    path = a_star_search(known_map, start_grid, target_grid)
-                    if path:
-                        robot.path = path
-                        # Eğer bitmişse FINISHED modunda kalsın ama hareket etsin diye özel bir durum yaratmıyoruz,
-                        # sadece path bitene kadar navigate fonksiyonu çalışacak.
-                        # Ancak hareket fonksiyonumuz moda bağlı olduğu için geçici olarak NAVIGATE yapıyoruz.
-                        robot.mode = "NAVIGATE"
-
-        # --- LOJİK ---
-        if robot.mode == "EXPLORE":
-            robot.auto_explore(real_world_map)
-            
-            # Yüzde Hesabı
-            total_cells = COLS * ROWS
-            unknown_count = np.count_nonzero(known_map == VAL_UNKNOWN)
-            explored_ratio = 1.0 - (unknown_count / total_cells)
+                    if worker:
+                        # Robot, plan gelene kadar olduğu yerde bekler
+                        click_target = target_grid
+                        request_path(target_grid)
+                    else:
+                        path = click_planner.plan(known_map, world.version, start_grid, target_grid)
+                        if path:
+                            robot.path = path
+                            # Eğer bitmişse FINISHED modunda kalsın ama hareket etsin diye özel bir durum yaratmıyoruz,
+                            # sadece path bitene kadar navigate fonksiyonu çalışacak.
+                            # Ancak hareket fonksiyonumuz moda bağlı olduğu için geçici olarak NAVIGATE yapıyoruz.
+                            robot.mode = "NAVIGATE"
+
+        # Arka plan planı hazırsa alınır. Bu arada harita değiştiyse (sürüm
+        # farklı) sonuç eskimiştir: Atılır ve hedef güncel hafızayla yeniden planlanır.
+        done = worker.poll() if worker else None
+        if done and click_target and (robot.mode == "PAUSED" or robot.mode == "FINISHED"):
+            version, path = done
+            if version != world.version:
+                request_path(click_target, retry=True)
+            elif path:
+                robot.path = path
+                robot.mode = "NAVIGATE"
+
+        # --- SİMÜLASYON ADIMLARI (Kare başına K adım) ---
+        for _ in sim.steps():
+            # --- LOJİK ---
+            if robot.mode == "EXPLORE":
+                robot.auto_explore()
             
-            # HEDEFE ULAŞINCA OTOMATİK DUR VE KAYDET
-            if explored_ratio >= EXPLORATION_GOAL:
-                print("Tarama bitti. Harita kaydediliyor.")
-                save_map_matrix(known_map, "tamamlanmis_harita.txt")
-                robot.mode = "FINISHED"
-        
-        elif robot.mode == "NAVIGATE":
-            robot.navigate()
-            # Yol bitince, eğer harita zaten bitmişse FINISHED moduna dön
-            if not robot.path:
-                total_cells = COLS * ROWS
-                unknown_count = np.count_nonzero(known_map == VAL_UNKNOWN)
-                if (1.0 - unknown_count / total_cells) >= EXPLORATION_GOAL:
+                # HEDEFE ULAŞINCA OTOMATİK DUR VE KAYDET
+                # (Keşif oranı sensör sayaçlarından gelir, harita taranmaz)
+                if world.exploration_finished(world.cell_of(robot.x, robot.y), VIEW_RANGE, EXPLORATION_GOAL):
+                    print("Tarama bitti. Harita kaydediliyor.")
+                    save_map_matrix(known_map, "tamamlanmis_harita.txt")
                     robot.mode = "FINISHED"
-                else:
-                    robot.mode = "PAUSED"
-
-        # Sensör Güncelleme
-        r_grid_x = int(robot.x) // GRID_SIZE
-        r_grid_y = int(robot.y) // GRID_SIZE
-        view_range = 5 
-        for i in range(-view_range, view_range + 1):
-            for j in range(-view_range, view_range + 1):
-                nx, ny = r_grid_x + i, r_grid_y + j
-                if 0 <= nx < COLS and 0 <= ny < ROWS:
-                    known_map[nx][ny] = real_world_map[nx][ny]
+        
+            elif robot.mode == "NAVIGATE":
+                robot.navigate()
+                # Yol bitince, eğer harita zaten bitmişse FINISHED moduna dön
+                if not robot.path:
+                    if world.explored_ratio >= EXPLORATION_GOAL or world.observation_complete(world.cell_of(robot.x, robot.y), VIEW_RANGE):
+                        robot.mode = "FINISHED"
+                    else:
+                        robot.mode = "PAUSED"
 
-        # --- ÇİZİM ---
-        win.fill((0, 0, 0))
-        for x in range(COLS):
-            for y in range(ROWS):
-                rect = (x * GRID_SIZE, y * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-                cell_val = known_map[x][y]
-                if cell_val == VAL_UNKNOWN:
-                    pygame.draw.rect(win, UNKNOWN_COLOR, rect)
-                elif cell_val == VAL_FREE:
-                    pygame.draw.rect(win, FREE_COLOR, rect)
-                    pygame.draw.rect(win, (255,255,255), rect, 1)
-                elif cell_val == VAL_WALL:
-                    pygame.draw.rect(win, WALL_COLOR, rect)
+            # Sensör Güncelleme
+            r_grid_x, r_grid_y = world.cell_of(robot.x, robot.y)
+            revealed = world.sense(r_grid_x, r_grid_y, VIEW_RANGE)
+            renderer.mark(revealed)
 
+        # --- ÇİZİM ---
+        renderer.flush(known_map)
+        renderer.draw(win)
         robot.draw(win)
 
         # --- ARAYÜZ ---
         # Sol üst bilgi
-        info_bg = pygame.Rect(5, 5, 360, 30)
+        info_bg = pygame.Rect(5, 5, 720, 30)
         pygame.draw.rect(win, (255, 255, 255), info_bg)
         pygame.draw.rect(win, (0, 0, 0), info_bg, 2)
         
         # 'R' tuşunu kaldırdık
-        keys_text = "Tuşlar ->  S: Kaydet  |  Q: Durdur/Devam"
+        keys_text = f"Tuşlar ->  S: Kaydet  |  B: İkili Kaydet  |  Q: Durdur/Devam  |  {sim.label()}"
         text_surf = font.render(keys_text, True, TEXT_COLOR)
         win.blit(text_surf, (15, 10))
 
@@ -298,6 +295,8 @@ def main():
 
         pygame.display.update()
 
+    if worker:
+        worker.stop()
     pygame.quit()
 
 if __name__ == "__main__":
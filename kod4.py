@@ -1,19 +1,38 @@
 import pygame
 import math
 import numpy as np
-import heapq
+import sys
+import time
+from frontier import FrontierIndex, GAIN_WEIGHT
+from regions import finalize_unknown
+from sensor import window_count
+from world import World
+from renderer import MapRenderer
+from map_io import save_map
+from sim_clock import SimClock
+from plan_worker import PlanWorker
 
 # --- AYARLAR ---
 WIDTH, HEIGHT = 800, 600
 GRID_SIZE = 20
 COLS, ROWS = WIDTH // GRID_SIZE, HEIGHT // GRID_SIZE
 ROBOT_RADIUS = 10
+ROBOT_COUNT = 1 # Aynı haritayı paylaşan robot sayısı (--robots N)
+# Planlar arka plandaki bir iş parçacığında hesaplanır; çizim plan beklerken
+# durmaz (headless koşular her zaman aynı iş parçacığında, tekrarlanabilir)
+BACKGROUND_PLANNING = True
+# Sınır parçası seçen stratejiler -> FrontierIndex.select kazanç ağırlığı
+# "info_gain": Çok alan açacak parçayı tercih eder
+# "small_segments": Küçük parçaları (kırıntıları) yakındayken önce bitirir
+SELECT_GAIN_WEIGHTS = {"info_gain": GAIN_WEIGHT, "small_segments": -1.0}
 
 # Renkler
 UNKNOWN_COLOR = (240, 230, 140) # Sarı
 FREE_COLOR = (200, 200, 200)    # Gri
 WALL_COLOR = (0, 0, 0)          # Siyah
 ROBOT_COLOR = (255, 0, 0)       # Kırmızı
+# Ekipte 2., 3., ... robotların renkleri (ilk robot ROBOT_COLOR)
+TEAM_COLORS = [(255, 0, 0), (160, 0, 200), (255, 120, 0), (0, 150, 0), (0, 120, 255), (150, 75, 0)]
 PATH_COLOR = (0, 0, 255)        # Mavi
 SENSOR_BOX_COLOR = (0, 255, 255)# Turkuaz
 TEXT_COLOR = (0, 100, 0)        
@@ -24,72 +43,144 @@ VAL_FREE = 1
 VAL_WALL = 0
 
 class Robot:
-    def __init__(self, x, y):
+    def __init__(self, x, y, world, frontier=None):
         self.x = x
         self.y = y
+        self.world = world
+        self.color = ROBOT_COLOR
         self.speed = 5
         self.path = []      
         self.target = None  
+        self.path_cells = set() # Yolun kareleri (yeni duvar kontrolü için)
+        self.replan = True # Hedef görülünce / yol kapanınca yeniden planla
+        self.replans = 0
+        # Hedef seçimi: "nearest" (en yakın sınır) ya da sınır parçalarını
+        # kazanç ve maliyetle puanlayan "info_gain" / "small_segments"
+        self.strategy = "nearest"
         self.finished = False
         self.paused = False # Duraklatma durumu
+        self.autosave = True # Bitişte haritayı kaydet (Headless modda kapatılır)
+        self.unexplored = None # Bitişte keşfedilemeyen bilinmeyen kareler (bool maske)
         
         # --- İSTEK: ÇAP 3 OLARAK REVİZE EDİLDİ ---
         # Merkezden 3 birim sağa/sola/yukarı/aşağı (Toplam genişlik 7 kare)
         self.view_range = 3 
 
-    def sense(self, real_map, known_map):
-        """Sensör: Etrafı tara ve hafızaya yaz"""
-        r_grid_x = int(self.x // GRID_SIZE)
-        r_grid_y = int(self.y // GRID_SIZE)
-        
-        for i in range(-self.view_range, self.view_range + 1):
-            for j in range(-self.view_range, self.view_range + 1):
-                nx, ny = r_grid_x + i, r_grid_y + j
-                
-                if 0 <= nx < COLS and 0 <= ny < ROWS:
-                    known_map[nx][ny] = real_map[nx][ny]
-
-    def think(self, known_map):
-        """Rota Planlama"""
-        if self.path or self.finished or self.paused:
-            return 
-
-        start_node = (int(self.x // GRID_SIZE), int(self.y // GRID_SIZE))
-        
-        # En yakın ulaşılabilir bilinmeyen alanı bul
-        frontier_target = find_nearest_unknown(known_map, start_node)
-
-        if frontier_target:
-            self.path = a_star_search(known_map, start_node, frontier_target)
+        # Sınır kareleri (Frontier): Sensör her taramada günceller
+        # (Ekipte tüm robotlar aynı kümeyi paylaşır)
+        if frontier is None:
+            frontier = FrontierIndex(world.cols, world.rows)
+        self.frontier = frontier
+
+    def sense(self):
+        """Sensör: Etrafı tara, hafızaya yaz ve yeni açılan kareleri döndür"""
+        r_grid_x, r_grid_y = self.world.cell_of(self.x, self.y)
+        revealed = self.world.sense(r_grid_x, r_grid_y, self.view_range)
+        self.frontier.update(self.world.known_map, revealed)
+        return revealed
+
+    def check_path(self, revealed):
+        """Yeni açılan kareler (revealed = (xs, ys)) yolu geçersiz kıldıysa yolu bırakır."""
+        if self.replan and self.path and self.path_invalid(revealed):
+            self.abort_path()
+
+    def path_invalid(self, revealed):
+        """
+        Hedef artık sınır karesi değilse (etrafı görüldüyse) ya da yeni açılan
+        duvarlardan biri yolun üzerindeyse True. Sadece bu tick'in farkına
+        bakılır; harita ve yol baştan taranmaz.
+        Hedef sensör menzilindeyse yol bitirilir: birkaç adım için yeniden
+        planlamak, robotu yakın sınırlar arasında gidip geldirir.
+        Sınır olmaktan çıkan hedefin sensör penceresinde hâlâ bilinmeyen kare
+        varsa (duvar arkasındaki kenar kareleri gibi, hiçbir sınırın komşusu
+        olmayan kareler) yola devam edilir; yoksa bu kareler hiç görülmez.
+        """
+        if (self.target not in self.frontier and len(self.path) > self.view_range
+                and not window_count(self.world.known_map, *self.target, self.view_range, VAL_UNKNOWN)):
+            return True
+        xs, ys = revealed
+        walls = self.world.known_map[xs, ys] == VAL_WALL
+        if not walls.any():
+            return False
+        return any(cell in self.path_cells for cell in zip(xs[walls].tolist(), ys[walls].tolist()))
+
+    def abort_path(self):
+        """
+        Geçerliliğini yitiren yolu bırakır. Robot o an gittiği kareye
+        (duvar değilse) varınca think yeni sınır karesini seçer.
+        """
+        next_cell = self.path[0]
+        if self.world.known_map[next_cell] == VAL_WALL:
+            self.path = []
         else:
-            # --- İSTEK: SİYAH BÖLGE İÇİNİ DÜZELTME ---
-            # Eğer gidilecek ulaşılabilir sarı alan kalmadıysa, 
-            # haritada kalan diğer tüm sarı alanlar (duvarların içi) 
-            # ulaşılamaz demektir. Onları siyaha (Duvar) çeviriyoruz.
-            self.finalize_map(known_map)
-            
+            self.path = [next_cell]
+        self.path_cells = set(self.path)
+        self.target = None
+        self.replans += 1
+
+    def plan(self, claimed=()):
+        """
+        Yeni sınır hedefi ve yolu seçer; bulunamazsa False.
+        claimed: Ekipteki diğer robotların hedefleri; bunlara sensör
+        menzilindeki sınır kareleri seçilmez.
+        """
+        start_node = self.world.cell_of(self.x, self.y)
+        found = self.find_target(self.world.known_map, self.frontier, start_node, claimed)
+        if not found:
+            return False
+        self.set_path(*found[0])
+        return True
+
+    def find_target(self, known_map, frontier, start_node, claimed=()):
+        """
+        Sınır hedefi ve yolunu arar: [(hedef, yol)] ya da []. Robotun
+        durumunu değiştirmez; hafıza ve sınır kümesinin kopyasıyla arka
+        planda da çalışır.
+        """
+        # Hedef ve yolu tek BFS geçişinde bulunur; ulaşılamayan sınır
+        # kareleri hiç ziyaret edilmez.
+        if self.strategy == "nearest":
+            return frontier.search(known_map, start_node, claimed=claimed, claim_range=self.view_range)
+        return frontier.select(known_map, start_node, self.view_range, SELECT_GAIN_WEIGHTS[self.strategy],
+                               claimed=claimed, claim_range=self.view_range)
+
+    def set_path(self, target, path):
+        self.target, self.path = target, path
+        self.path_cells = set(path)
+
+    def finish(self):
+        """Gidilecek sınır kalmadı: Haritayı son haline getirir ve kaydeder."""
+        known_map = self.world.known_map
+
+        # --- İSTEK: SİYAH BÖLGE İÇİNİ DÜZELTME ---
+        # Eğer gidilecek ulaşılabilir sarı alan kalmadıysa, 
+        # haritada kalan sarı alanlardan duvarların içinde kalanlar
+        # siyaha (Duvar) çevrilir; kenara veya ulaşılamayan ceplere
+        # açılanlar keşfedilmemiş olarak işaretlenip sarı bırakılır.
+        self.finalize_map(known_map)
+        self.world.recount()
+        
+        if self.autosave:
             print("Haritalama ve Temizlik Tamamlandı!")
+            if self.world.unknown_count:
+                print(f"Keşfedilemeyen kare sayısı: {self.world.unknown_count}")
             save_map_matrix(known_map, "final_harita.txt")
-            self.finished = True
+        self.finished = True
 
     def finalize_map(self, known_map):
         """
-        Bitiş anında duvarların içinde kalan 'Bilinmeyen' (2) yerleri
-        'Duvar' (0) olarak işaretler.
+        Bitiş anında 'Bilinmeyen' (2) bölgeleri bağlı bileşenlere ayırır:
+        duvarların içinde kalanlar 'Duvar' (0) olur. Diğerleri
+        self.unexplored maskesinde tutulur.
         """
-        for x in range(COLS):
-            for y in range(ROWS):
-                if known_map[x][y] == VAL_UNKNOWN:
-                    known_map[x][y] = VAL_WALL
+        self.unexplored = finalize_unknown(known_map)
 
     def move(self):
         """Hareket"""
         if self.paused or not self.path:
             return
 
-        target_grid = self.path[0]
-        target_px_x = target_grid[0] * GRID_SIZE + GRID_SIZE // 2
-        target_px_y = target_grid[1] * GRID_SIZE + GRID_SIZE // 2
+        target_px_x, target_px_y = self.world.cell_center(self.path[0])
 
         dx = target_px_x - self.x
         dy = target_px_y - self.y
@@ -105,117 +196,188 @@ class Robot:
             self.y += math.sin(angle) * self.speed
 
     def draw(self, win):
-        pygame.draw.circle(win, ROBOT_COLOR, (int(self.x), int(self.y)), ROBOT_RADIUS)
+        pygame.draw.circle(win, self.color, (int(self.x), int(self.y)), ROBOT_RADIUS)
         
         # Sensör Alanı (Turkuaz Kare)
-        top_left_grid_x = int(self.x // GRID_SIZE) - self.view_range
-        top_left_grid_y = int(self.y // GRID_SIZE) - self.view_range
-        px_x = top_left_grid_x * GRID_SIZE
-        px_y = top_left_grid_y * GRID_SIZE
-        size = (self.view_range * 2 + 1) * GRID_SIZE
+        cell_size = self.world.cell_size
+        grid_x, grid_y = self.world.cell_of(self.x, self.y)
+        px_x = (grid_x - self.view_range) * cell_size
+        px_y = (grid_y - self.view_range) * cell_size
+        size = (self.view_range * 2 + 1) * cell_size
         
         pygame.draw.rect(win, SENSOR_BOX_COLOR, (px_x, px_y, size, size), 2)
 
         if len(self.path) > 1:
             points = [(self.x, self.y)]
             for node in self.path:
-                px = node[0] * GRID_SIZE + GRID_SIZE // 2
-                py = node[1] * GRID_SIZE + GRID_SIZE // 2
-                points.append((px, py))
+                points.append(self.world.cell_center(node))
             pygame.draw.lines(win, PATH_COLOR, False, points, 2)
 
-# --- YARDIMCI ALGORİTMALAR ---
+class Team:
+    """
+    Aynı hafızayı (world.known_map) ve sınır kümesini paylaşan robotlar.
+    Her robotun kendi sensör penceresi vardır. Boşta kalan robotlara sırayla
+    (açgözlü) hedef atanır: Diğer robotların hedeflerine sensör menzilinde
+    olan sınır kareleri atlanır, böylece robotlar aynı sınırı kovalamaz.
+    Hiçbir robotun yolu kalmayınca ve hiçbiri hedef bulamayınca keşif biter.
+    worker (PlanWorker) verilirse planlar arka planda hesaplanır (bkz. think_background).
+    """
+    # Hedef bulamayan robot (boştaki sınırlar başkalarına ayrılmış) bu kadar
+    # tick bekleyip yeniden dener; her tick'te bütün haritayı aramaz.
+    RETRY_TICKS = 5
+
+    def __init__(self, world, starts, view_range=3, strategy="nearest", replan=True, worker=None):
+        self.world = world
+        self.worker = worker
+        self.frontier = FrontierIndex(world.cols, world.rows)
+        self.robots = []
+        for i, (x, y) in enumerate(starts):
+            robot = Robot(x, y, world, self.frontier)
+            robot.view_range = view_range
+            robot.strategy = strategy
+            robot.replan = replan
+            robot.color = TEAM_COLORS[i % len(TEAM_COLORS)]
+            self.robots.append(robot)
+        self.finished = False
+        self.paused = False
+        self.ticks = 0
+        self.retry_tick = {robot: 0 for robot in self.robots}
 
-def find_nearest_unknown(grid, start):
-    rows = len(grid[0])
-    cols = len(grid)
-    queue = [start]
-    visited = set()
-    visited.add(start)
-
-    while queue:
-        cx, cy = queue.pop(0)
-
-        if grid[cx][cy] == VAL_UNKNOWN:
-            return (cx, cy)
-
-        for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-            nx, ny = cx + dx, cy + dy
-            if 0 <= nx < cols and 0 <= ny < rows:
-                if (nx, ny) not in visited:
-                    # Sadece Duvar Olmayan yerlerden geçerek ara
-                    if grid[nx][ny] != VAL_WALL:
-                        visited.add((nx, ny))
-                        queue.append((nx, ny))
-    return None
-
-def heuristic(a, b):
-    return abs(a[0] - b[0]) + abs(a[1] - b[1])
-
-def a_star_search(grid, start, goal):
-    neighbors = [(0, 1), (0, -1), (1, 0), (-1, 0)]
-    close_set = set()
-    came_from = {}
-    g_score = {start: 0}
-    f_score = {start: heuristic(start, goal)}
-    oheap = []
-    heapq.heappush(oheap, (f_score[start], start))
-
-    while oheap:
-        current = heapq.heappop(oheap)[1]
-
-        if current == goal:
-            data = []
-            while current in came_from:
-                data.append(current)
-                current = came_from[current]
-            return data[::-1] 
-
-        close_set.add(current)
-        for i, j in neighbors:
-            neighbor = current[0] + i, current[1] + j
-            
-            if 0 <= neighbor[0] < COLS and 0 <= neighbor[1] < ROWS:
-                if grid[neighbor[0]][neighbor[1]] == VAL_WALL:
-                    continue
-            else:
-                continue
-                
-            tentative_g_score = g_score[current] + 1
-            if neighbor in close_set and tentative_g_score >= g_score.get(neighbor, 0):
+    @property
+    def autosave(self):
+        return self.robots[0].autosave
+
+    @autosave.setter
+    def autosave(self, value):
+        self.robots[0].autosave = value
+
+    def sense(self):
+        """
+        Tüm robotlar tarar; yeni açılan kareler (xs, ys) listesi döner.
+        Yollar, bütün robotların açtığı karelerle birlikte kontrol edilir:
+        Bir robotun yolundaki duvarı başka bir robot görmüş olabilir.
+        """
+        revealed = [robot.sense() for robot in self.robots]
+        combined = (np.concatenate([xs for xs, _ in revealed]), np.concatenate([ys for _, ys in revealed]))
+        for robot in self.robots:
+            robot.check_path(combined)
+        return revealed
+
+    def think(self):
+        if self.finished or self.paused:
+            return
+        self.ticks += 1
+        if self.worker is not None:
+            self.think_background()
+            return
+        idle = [robot for robot in self.robots if not robot.path]
+        all_idle = len(idle) == len(self.robots)
+
+        stuck = 0
+        for robot in idle:
+            if not all_idle and self.retry_tick[robot] > self.ticks:
                 continue
-            if tentative_g_score < g_score.get(neighbor, float('inf')) or neighbor not in [i[1] for i in oheap]:
-                came_from[neighbor] = current
-                g_score[neighbor] = tentative_g_score
-                f_score[neighbor] = tentative_g_score + heuristic(neighbor, goal)
-                heapq.heappush(oheap, (f_score[neighbor], neighbor))
-    return []
-
-def save_map_matrix(grid, filename):
-    rows = len(grid[0]) 
-    cols = len(grid)    
+            claimed = [other.target for other in self.robots if other is not robot and other.path and other.target]
+            if not robot.plan(claimed):
+                stuck += 1
+                self.retry_tick[robot] = self.ticks + self.RETRY_TICKS
+
+        if all_idle and stuck == len(self.robots):
+            # Kimsenin yolu yok ve hiçbir robot hedef bulamadı
+            self.finish()
+
+    def think_background(self):
+        """
+        think'in arka plan sürümü. Boştaki robotların hedefleri, hafızanın ve
+        sınır kümesinin kopyasıyla worker'da aranır; robotlar plan gelene
+        kadar bekler, yolu olanlar yollarını izler. Gelen plan, harita sürümü
+        değişmediyse aynen; değiştiyse sadece hedef hâlâ sınır ve yol hâlâ
+        açıksa kabul edilir, aksi halde atılır ve robot yeniden planlanır.
+        """
+        done = self.worker.poll()
+        if done:
+            version, (results, all_idle) = done
+            stuck = 0
+            for robot, found in results:
+                if not found:
+                    stuck += 1
+                    self.retry_tick[robot] = self.ticks + self.RETRY_TICKS
+                elif version == self.world.version or self.plan_valid(*found[0]):
+                    robot.set_path(*found[0])
+            if all_idle and stuck == len(self.robots) and version == self.world.version:
+                self.finish()
+                return
+        if self.worker.busy:
+            return # Kopyalar boşuna alınmasın; asıl kontrol try_submit'te
+
+        idle = [robot for robot in self.robots if not robot.path]
+        all_idle = len(idle) == len(self.robots)
+        due = [robot for robot in idle if all_idle or self.retry_tick[robot] <= self.ticks]
+        if not due:
+            return
+        requests = [(robot, self.world.cell_of(robot.x, robot.y)) for robot in due]
+        claimed = [robot.target for robot in self.robots if robot.path and robot.target]
+        # poll() ile buraya kadar biten bir plan varsa gönderilmez; plan sonraki tick'te alınır
+        self.worker.try_submit(self.world.version, plan_requests, self.world.known_map.copy(),
+                               self.frontier.copy(), requests, claimed, all_idle)
+
+    def plan_valid(self, target, path):
+        """Eski haritayla bulunan plan hâlâ geçerli mi? (Hedef sınır, yolda duvar yok)"""
+        if target not in self.frontier:
+            return False
+        xs, ys = zip(*path)
+        return not (self.world.known_map[list(xs), list(ys)] == VAL_WALL).any()
+
+    def finish(self):
+        """Kimsenin yolu yok ve hiçbir robot hedef bulamadı: Keşif biter."""
+        self.robots[0].finish()
+        for robot in self.robots:
+            robot.finished = True
+        self.finished = True
+
+    def move(self):
+        for robot in self.robots:
+            robot.paused = self.paused
+            robot.move()
+
+    def draw(self, win):
+        for robot in self.robots:
+            robot.draw(win)
+
+# --- YARDIMCI ALGORİTMALAR ---
+
+def plan_requests(known_map, frontier, requests, claimed, all_idle):
+    """
+    Arka plan işi (Team.think_background): requests = [(robot, başlangıç), ...]
+    robotlarına sırayla, Team.think ile aynı açgözlü atamayla hedef arar.
+    Dönen değer ([(robot, found), ...], all_idle).
+    """
+    claimed = list(claimed)
+    results = []
+    for robot, start_node in requests:
+        found = robot.find_target(known_map, frontier, start_node, claimed)
+        results.append((robot, found))
+        if found:
+            claimed.append(found[0][0])
+    return results, all_idle
+
+def save_map_matrix(grid, filename, metadata=None):
     try:
-        with open(filename, "w") as f:
-            for y in range(rows):
-                line = []
-                for x in range(cols):
-                    val = int(grid[x][y])
-                    line.append(str(val))
-                f.write(" ".join(line) + "\n")
+        save_map(grid, filename, metadata=metadata)
         print(f"-> Manuel Kayıt Yapıldı: {filename}")
     except Exception as e:
         print(f"HATA: {e}")
 
 # --- ANA PROGRAM ---
 
-def generate_map():
-    grid = np.ones((COLS, ROWS), dtype=int) * VAL_FREE
+def generate_map(cols=COLS, rows=ROWS):
+    grid = np.full((cols, rows), VAL_FREE, dtype=np.uint8)
     
     # Çerçeve
-    grid[0:COLS, 0] = VAL_WALL
-    grid[0:COLS, ROWS-1] = VAL_WALL
-    grid[0, 0:ROWS] = VAL_WALL
-    grid[COLS-1, 0:ROWS] = VAL_WALL
+    grid[0:cols, 0] = VAL_WALL
+    grid[0:cols, rows-1] = VAL_WALL
+    grid[0, 0:rows] = VAL_WALL
+    grid[cols-1, 0:rows] = VAL_WALL
     
     # Büyük Bloklar (İçi dolu görünsün diye)
     grid[10:18, 10:25] = VAL_WALL 
@@ -224,78 +386,147 @@ def generate_map():
     
     return grid
 
-def main():
+def run_headless(real_world_map=None, start=(50, 50), max_ticks=1000000, view_range=3, sample_every=10, replan=True,
+                 strategy="nearest", robots=1):
+    """
+    Pencere açmadan ve FPS sınırı olmadan keşfi çalıştırır.
+    Harita herhangi bir boyutta olabilir; dünya onun boyutlarından kurulur.
+    robots > 1 ise hepsi start noktasından çıkan bir ekip (Team) çalışır.
+    Döndürülen sözlük: tick sayısı, gidilen toplam yol (kare), planlama CPU
+    süresi (sn; iş parçacığının süresi, paralel koşularda şişmez),
+    yeniden planlama sayısı, bitiş süresi (sn), her sample_every tickte bir
+    (tick, keşif oranı) örnekleri ve ortak hafızadaki son harita.
+    """
+    if real_world_map is None:
+        real_world_map = generate_map()
+    world = World(real_world_map, GRID_SIZE)
+    known_map = world.known_map
+
+    team = Team(world, [start] * robots, view_range, strategy, replan)
+    team.autosave = False
+
+    ticks = 0
+    path_length = 0.0
+    planning_cpu_time = 0.0
+    coverage = []
+    t_start = time.perf_counter()
+
+    while not team.finished and ticks < max_ticks:
+        team.sense()
+
+        t0 = time.thread_time()
+        team.think()
+        planning_cpu_time += time.thread_time() - t0
+
+        old = [(robot.x, robot.y) for robot in team.robots]
+        team.move()
+        for robot, (old_x, old_y) in zip(team.robots, old):
+            path_length += math.hypot(robot.x - old_x, robot.y - old_y)
+        ticks += 1
+
+        if ticks % sample_every == 0 or team.finished:
+            coverage.append((ticks, world.explored_ratio))
+
+    return {
+        "ticks": ticks,
+        "robots": robots,
+        "path_length": path_length / world.cell_size,
+        "planning_cpu_time": planning_cpu_time,
+        "replans": sum(robot.replans for robot in team.robots),
+        "time_to_finish": time.perf_counter() - t_start,
+        "finished": team.finished,
+        "coverage": coverage,
+        "known_map": known_map,
+    }
+
+def main(robot_count=ROBOT_COUNT):
     pygame.init()
     win = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Otonom Haritalama (Q: Durdur, S: Kaydet)")
-    clock = pygame.time.Clock()
+    sim = SimClock(fps=60)
     font = pygame.font.SysFont("Arial", 20, bold=True)
 
-    real_world_map = generate_map()
-    known_map = np.full((COLS, ROWS), VAL_UNKNOWN, dtype=int)
+    world = World(generate_map(), GRID_SIZE)
+    known_map = world.known_map
+    renderer = MapRenderer(known_map, world.cell_size, {VAL_UNKNOWN: UNKNOWN_COLOR, VAL_FREE: FREE_COLOR, VAL_WALL: WALL_COLOR})
 
-    robot = Robot(50, 50) 
+    # Tüm robotlar aynı noktadan çıkar; hedef ataması onları dağıtır
+    worker = PlanWorker() if BACKGROUND_PLANNING else None
+    team = Team(world, [(50, 50)] * robot_count, worker=worker)
 
     running = True
     while running:
-        clock.tick(60) 
+        sim.tick() 
         
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
+
+            # +/-: Simülasyon hızı (Kare başına adım)
+            sim.handle_event(event)
             
             # --- TUŞ KONTROLLERİ ---
             if event.type == pygame.KEYDOWN:
                 # Q: Durdur / Devam (Haritayı kapatmaz)
                 if event.key == pygame.K_q:
-                    robot.paused = not robot.paused
-                    status = "DURAKLATILDI" if robot.paused else "DEVAM EDİYOR"
+                    team.paused = not team.paused
+                    status = "DURAKLATILDI" if team.paused else "DEVAM EDİYOR"
                     print(f"Simülasyon {status}")
 
                 # S: Manuel Kayıt (Haritayı kapatmaz)
                 if event.key == pygame.K_s:
                     save_map_matrix(known_map, "manuel_kayit.txt")
 
-        # --- ROBOT DÖNGÜSÜ ---
+                # B: İkili Kayıt
+                if event.key == pygame.K_b:
+                    save_map_matrix(known_map, "manuel_kayit.rsm", {"robots": [[robot.x, robot.y] for robot in team.robots]})
+
+        # --- ROBOT DÖNGÜSÜ (Kare başına K adım) ---
         # Sadece duraklatılmamışsa çalış
-        if not robot.paused:
-            robot.sense(real_world_map, known_map)
-            robot.think(known_map)
-            robot.move()
+        for _ in sim.steps():
+            if team.paused or team.finished:
+                break
+            for revealed in team.sense():
+                renderer.mark(revealed)
+
+            team.think()
+            if team.finished:
+                # Bitiş adımı (finalize_map) haritanın geneline dokunur
+                renderer.redraw(known_map)
+            team.move()
 
         # --- ÇİZİM ---
-        win.fill((0, 0, 0))
-        
-        for x in range(COLS):
-            for y in range(ROWS):
-                rect = (x * GRID_SIZE, y * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-                cell_val = known_map[x][y]
-                
-                if cell_val == VAL_UNKNOWN:
-                    pygame.draw.rect(win, UNKNOWN_COLOR, rect) 
-                elif cell_val == VAL_FREE:
-                    pygame.draw.rect(win, FREE_COLOR, rect)   
-                    pygame.draw.rect(win, (255, 255, 255), rect, 1) 
-                elif cell_val == VAL_WALL:
-                    pygame.draw.rect(win, WALL_COLOR, rect)   
-
-        robot.draw(win)
+        renderer.flush(known_map)
+        renderer.draw(win)
+        team.draw(win)
 
         # Bilgi Paneli
-        info_rect = pygame.Rect(10, 10, 320, 40)
+        info_rect = pygame.Rect(10, 10, 660, 40)
         pygame.draw.rect(win, (255, 255, 255), info_rect)
         pygame.draw.rect(win, (0, 0, 0), info_rect, 2)
         
-        status_text = "DURAKLATILDI" if robot.paused else "ÇALIŞIYOR"
-        if robot.finished: status_text = "TAMAMLANDI"
+        status_text = "DURAKLATILDI" if team.paused else "ÇALIŞIYOR"
+        if team.finished: status_text = "TAMAMLANDI"
         
-        info_msg = f"Durum: {status_text} | 'Q': Dur/Başla 'S': Kaydet"
+        info_msg = f"Durum: {status_text} | 'Q': Dur/Başla 'S': Kaydet 'B': İkili | {sim.label()}"
         text_surf = font.render(info_msg, True, (0, 0, 0))
         win.blit(text_surf, (15, 20))
 
         pygame.display.update()
 
+    if worker:
+        worker.stop()
     pygame.quit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    robot_count = ROBOT_COUNT
+    if "--robots" in sys.argv:
+        robot_count = int(sys.argv[sys.argv.index("--robots") + 1])
+
+    if "--headless" in sys.argv:
+        stats = run_headless(robots=robot_count)
+        stats.pop("known_map")
+        stats.pop("coverage")
+        print(stats)
+    else:
+        main(robot_count)
\ No newline at end of file
@@ -0,0 +1,124 @@
+import json
+import struct
+import numpy as np
+
+# --- 2 BİTLİK PAKETLEME ---
+# Durum kodları 0, 1, 2 olduğu için her kare 2 bite sığar (1 baytta 4 kare).
+
+def pack_grid(grid):
+    """uint8 haritayı 2 bitlik paketlenmiş bayt dizisine çevirir."""
+    flat = np.asarray(grid, dtype=np.uint8).ravel()
+    pad = (-len(flat)) % 4
+    if pad:
+        flat = np.concatenate([flat, np.zeros(pad, dtype=np.uint8)])
+    quads = flat.reshape(-1, 4)
+    return quads[:, 0] | (quads[:, 1] << 2) | (quads[:, 2] << 4) | (quads[:, 3] << 6)
+
+def unpack_grid(packed, shape):
+    """pack_grid ile paketlenmiş diziyi verilen boyutta uint8 haritaya açar."""
+    packed = np.asarray(packed, dtype=np.uint8)
+    quads = np.stack([(packed >> s) & 3 for s in (0, 2, 4, 6)], axis=1)
+    return quads.ravel()[:shape[0] * shape[1]].reshape(shape)
+
+# --- METİN MATRİS KAYDI ---
+
+# Büyük haritalar bu boyuttaki bloklar halinde dosyaya akıtılır
+BLOCK_BYTES = 1 << 22
+
+def write_matrix(grid, filename, header=()):
+    """
+    Haritayı (grid[x][y]) her satırı bir y olacak şekilde, sayılar arasında
+    boşluk olan metin matrisi olarak yazar. header satırları başa eklenir.
+    Transpoz ve sayı -> karakter dönüşümü vektörel yapılır; satırlar
+    BLOCK_BYTES büyüklüğünde bloklar halinde yazılır.
+    """
+    grid = np.asarray(grid)
+    cols, rows = grid.shape
+    block_rows = max(1, BLOCK_BYTES // (2 * cols))
+
+    with open(filename, "w") as f:
+        for line in header:
+            f.write(line + "\n")
+
+        for y0 in range(0, rows, block_rows):
+            block = grid[:, y0:y0 + block_rows].T
+            chars = np.full((block.shape[0], 2 * cols), ord(" "), dtype=np.uint8)
+            chars[:, 0::2] = block.astype(np.uint8) + ord("0")
+            chars[:, -1] = ord("\n")
+            f.write(chars.tobytes().decode("ascii"))
+
+# --- İKİLİ (BINARY) HARİTA DOSYASI ---
+# Başlık: sihirli sayı, biçim sürümü, kodlama, boyutlar, JSON metadata boyu.
+# Ardından metadata (JSON) ve 64 bayta hizalanmış harita verisi gelir.
+# Veri, bellekteki [x][y] (cols, rows) düzeniyle aynıdır; bu sayede
+# np.memmap ile kopyalanmadan açılabilir.
+
+BINARY_EXT = ".rsm"
+BINARY_MAGIC = b"RSMP"
+BINARY_VERSION = 1
+HEADER_FORMAT = "<4sHBBIII"  # magic, sürüm, kodlama, (boş), cols, rows, metadata boyu
+DATA_ALIGN = 64
+
+ENCODING_UINT8 = 0   # Kare başına 1 bayt (memmap ile doğrudan açılır)
+ENCODING_PACKED = 1  # Kare başına 2 bit (açılırken belleğe çözülür)
+
+def save_binary(grid, filename, metadata=None, packed=False):
+    """Haritayı ikili dosyaya yazar. metadata: JSON'a çevrilebilir sözlük (robot konumu, sürüm vb.)"""
+    grid = np.asarray(grid)
+    cols, rows = grid.shape
+    meta = json.dumps(metadata or {}).encode("utf-8")
+    encoding = ENCODING_PACKED if packed else ENCODING_UINT8
+
+    header = struct.pack(HEADER_FORMAT, BINARY_MAGIC, BINARY_VERSION, encoding, 0, cols, rows, len(meta))
+    offset = len(header) + len(meta)
+    padding = (-offset) % DATA_ALIGN
+
+    with open(filename, "wb") as f:
+        f.write(header)
+        f.write(meta)
+        f.write(b"\0" * padding)
+        if packed:
+            f.write(pack_grid(grid).tobytes())
+        else:
+            f.write(np.ascontiguousarray(grid, dtype=np.uint8).tobytes())
+
+def read_binary_header(filename):
+    """Dönen değer: (kodlama, (cols, rows), metadata, veri_ofseti)"""
+    size = struct.calcsize(HEADER_FORMAT)
+    with open(filename, "rb") as f:
+        raw = f.read(size)
+        if len(raw) < size:
+            raise ValueError(f"'{filename}' geçerli bir ikili harita değil (başlık eksik).")
+        magic, version, encoding, _, cols, rows, meta_len = struct.unpack(HEADER_FORMAT, raw)
+        if magic != BINARY_MAGIC:
+            raise ValueError(f"'{filename}' geçerli bir ikili harita değil.")
+        if version > BINARY_VERSION:
+            raise ValueError(f"Desteklenmeyen harita sürümü: {version}")
+        metadata = json.loads(f.read(meta_len).decode("utf-8"))
+
+    offset = size + meta_len
+    offset += (-offset) % DATA_ALIGN
+    return encoding, (cols, rows), metadata, offset
+
+def load_binary(filename, mode="r"):
+    """
+    İkili haritayı açar, (grid, metadata) döndürür.
+    uint8 kodlamada grid bir np.memmap'tir: dosya kopyalanmaz, sadece
+    erişilen sayfalar okunur. mode="r+" ile dosya yerinde düzenlenebilir.
+    """
+    encoding, shape, metadata, offset = read_binary_header(filename)
+    if encoding == ENCODING_UINT8:
+        grid = np.memmap(filename, dtype=np.uint8, mode=mode, offset=offset, shape=shape)
+    elif encoding == ENCODING_PACKED:
+        packed = np.memmap(filename, dtype=np.uint8, mode="r", offset=offset, shape=((shape[0] * shape[1] + 3) // 4,))
+        grid = unpack_grid(packed, shape)
+    else:
+        raise ValueError(f"Bilinmeyen kodlama: {encoding}")
+    return grid, metadata
+
+def save_map(grid, filename, header=(), metadata=None):
+    """Uzantıya göre kaydeder: BINARY_EXT ise ikili dosya, değilse metin matrisi."""
+    if filename.endswith(BINARY_EXT):
+        save_binary(grid, filename, metadata)
+    else:
+        write_matrix(grid, filename, header)
@@ -0,0 +1,61 @@
+import numpy as np
+from planner import VAL_UNKNOWN, a_star_search, jump_point_search, DistanceField, DStarLite
+from hpa import HPAPlanner
+
+class ClickPlanner:
+    """
+    Tıklama navigasyonu planlayıcısı (kod1-kod3).
+    method: "field" (önbellekli mesafe alanı), "dstar" (mesafe alanı; yol
+    kapanınca D* Lite ile artımlı onarım), "astar", "jps" veya "hpa".
+    diagonal: astar / jps için 8 komşuluk.
+    allow_unknown: Bilinmeyen kareler geçilebilir varsayılır (kod1).
+    Planlayıcı hafızanın kendi kopyası üzerinde çalışır: plan() önce kopyayı
+    verilen haritayla eşitler ve önbellekleri (mesafe alanı, HPA kümeleri,
+    D* Lite) sadece değişen karelerle günceller. Bu yüzden aynı nesne ana
+    döngüde canlı hafızayla ya da arka planda (PlanWorker) hafızanın anlık
+    kopyasıyla kullanılabilir; tek şart, hep aynı iş parçacığından çağrılmasıdır.
+    """
+    def __init__(self, shape, method="field", diagonal=False, allow_unknown=False):
+        self.method = method
+        self.diagonal = diagonal
+        self.allow_unknown = allow_unknown
+        self.grid = np.full(shape, VAL_UNKNOWN, dtype=np.uint8)
+        self.field = DistanceField(self.grid, allow_unknown) if method in ("field", "dstar") else None
+        self.hpa = HPAPlanner(self.grid, allow_unknown=allow_unknown) if method == "hpa" else None
+        self.dstar = None # Son hedefe giden D* Lite (ilk onarımda kurulur)
+
+    def sync(self, known_map, version):
+        """Kopyayı known_map ile eşitler; değişen kareler önbelleklere işlenir."""
+        changed = np.nonzero(self.grid != known_map)
+        self.grid[changed] = known_map[changed]
+        if self.field:
+            self.field.update(changed, version)
+        if self.hpa:
+            self.hpa.update(changed)
+        if self.dstar:
+            self.dstar.update(self.grid, changed)
+
+    def plan(self, known_map, version, start, goal):
+        """start -> goal yolu (başlangıç hariç, hedef dahil); yol yoksa []."""
+        self.dstar = None # Yeni hedef
+        self.sync(known_map, version)
+        if self.field:
+            return self.field.path(start, goal, version)
+        if self.hpa:
+            return self.hpa.find_path(start, goal)
+        if self.method == "jps":
+            return jump_point_search(self.grid, start, goal, self.allow_unknown, self.diagonal)
+        return a_star_search(self.grid, start, goal, self.allow_unknown, self.diagonal)
+
+    def repair(self, known_map, version, start, goal):
+        """
+        Yolu kapanan hedefe yeniden planlar. "dstar": D* Lite ilk onarımda
+        kurulur, sonraki onarımlar sadece değişen kareleri işler; diğer
+        yöntemler plan() ile baştan planlar.
+        """
+        if self.method != "dstar":
+            return self.plan(known_map, version, start, goal)
+        self.sync(known_map, version)
+        if self.dstar is None:
+            self.dstar = DStarLite(self.grid, start, goal, self.allow_unknown)
+        return self.dstar.plan(start)
@@ -0,0 +1,94 @@
+import threading
+
+class PlanWorker:
+    """
+    Planlama işlerini arka plandaki tek bir iş parçacığında çalıştırır; pygame
+    döngüsü plan beklerken durmaz.
+    İşler, hafızanın anlık kopyası (snapshot) ve o anki harita sürümüyle
+    (World.version) gönderilir. Sırada bekleyen eski iş, yeni istekle
+    değiştirilir (sadece son istek önemlidir). poll() son işin sonucunu
+    sürümüyle birlikte verir; sürümü eskimiş sonuçlar çağıran tarafından atılır.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.wake = threading.Condition(self.lock)
+        self.ticket = 0     # Son gönderilen işin numarası
+        self.job = None     # (numara, sürüm, fonksiyon, argümanlar)
+        self.active = False # İş parçacığı şu an bir iş çalıştırıyor mu
+        self.result = None  # (numara, sürüm, sonuç, hata)
+        self.running = True
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def submit(self, version, func, *args):
+        """
+        func(*args) işini sıraya koyar; bekleyen eski iş ve okunmamış sonucu
+        atılır. Yeni istek eskisini geçersiz kılıyorsa (yeni tıklama) kullanılır.
+        """
+        with self.wake:
+            self.put_job(version, func, args)
+
+    def try_submit(self, version, func, *args):
+        """
+        İşi sadece iş parçacığı boştaysa ve okunmamış sonuç yoksa sıraya koyar;
+        koyduysa True. Kontrol ve gönderme aynı kilitte yapılır: poll()'dan
+        sonra biten bir işin sonucu yeni iş yüzünden atılmaz, sonraki poll()'da alınır.
+        """
+        with self.wake:
+            if self.job is not None or self.active or self.result is not None:
+                return False
+            self.put_job(version, func, args)
+            return True
+
+    def put_job(self, version, func, args):
+        """İşi sıraya koyar (kilit tutulurken çağrılır)."""
+        self.ticket += 1
+        self.job = (self.ticket, version, func, args)
+        self.result = None
+        self.wake.notify()
+
+    @property
+    def busy(self):
+        """Sırada ya da çalışmakta olan bir iş var mı?"""
+        with self.lock:
+            return self.job is not None or self.active
+
+    def poll(self):
+        """Son gönderilen iş bittiyse (sürüm, sonuç), değilse None. İşteki hata burada yükselir."""
+        with self.lock:
+            result, self.result = self.result, None
+        if result is None:
+            return None
+        _, version, value, error = result
+        if error is not None:
+            raise error
+        return version, value
+
+    def stop(self):
+        with self.wake:
+            self.running = False
+            self.wake.notify()
+        self.thread.join()
+
+    def run(self):
+        while True:
+            with self.wake:
+                while self.job is None and self.running:
+                    self.wake.wait()
+                if not self.running:
+                    return
+                ticket, version, func, args = self.job
+                self.job = None
+                self.active = True
+
+            value, error = None, None
+            try:
+                value = func(*args)
+            except Exception as exc:
+                error = exc
+
+            with self.lock:
+                self.active = False
+                # Bu arada yeni bir iş geldiyse sonuç eskimiştir
+                if ticket == self.ticket:
+                    self.result = (ticket, version, value, error)
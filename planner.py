@@ -0,0 +1,573 @@
+import heapq
+import math
+from collections import deque
+import numpy as np
+
+# Durum Kodları (kod1-kod4 ile aynı)
+VAL_UNKNOWN = 2
+VAL_FREE = 1
+VAL_WALL = 0
+
+# Komşuluk (Sağ/Sol/Aşağı/Yukarı) - eski a_star_search ile aynı sıra
+NEIGHBORS = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+# Çapraz komşular (diagonal=True; adım maliyeti √2)
+DIAGONALS = [(1, 1), (1, -1), (-1, 1), (-1, -1)]
+SQRT2 = math.sqrt(2)
+
+def heuristic(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+def octile(a, b):
+    """8 komşuluk için oktil mesafe: Çapraz adımlar √2, düz adımlar 1."""
+    dx, dy = abs(a[0] - b[0]), abs(a[1] - b[1])
+    return max(dx, dy) + (SQRT2 - 1) * min(dx, dy)
+
+def path_cost(start, path):
+    """Yolun maliyeti: Düz adımlar 1, çapraz adımlar √2."""
+    cost = 0
+    prev = start
+    for cell in path:
+        cost += SQRT2 if cell[0] != prev[0] and cell[1] != prev[1] else 1
+        prev = cell
+    return cost
+
+def passable_mask(grid, allow_unknown=False):
+    """
+    Geçilebilir kareleri düz (flat) bir bool dizisi olarak döndürür.
+    allow_unknown=False: Sadece Boş (1) kareler (kod1-kod3)
+    allow_unknown=True : Duvar (0) olmayan her kare (kod4)
+    """
+    grid = np.asarray(grid)
+    if allow_unknown:
+        return (grid != VAL_WALL).ravel()
+    return (grid == VAL_FREE).ravel()
+
+def a_star_search(grid, start, goal, allow_unknown=False, diagonal=False):
+    """
+    Dizi tabanlı A* (Manhattan, 4 komşuluk).
+    g_score / came_from / kapalı küme, kare indeksiyle (x * rows + y)
+    erişilen önceden ayrılmış NumPy dizilerinde tutulur. came_from, ebeveyne
+    giden yönü (NEIGHBORS + DIAGONALS indeksi) 1 bayt olarak saklar. Heap'teki
+    eski kayıtlar çekildiklerinde kapalı küme kontrolüyle atlanır.
+    diagonal=True: 8 komşuluk (çapraz adım √2, oktil sezgisel); köşe
+    kesilmez, çapraz adım için iki yan kare de geçilebilir olmalıdır.
+    Dönen yol başlangıcı içermez, hedefi içerir; yol yoksa [].
+    """
+    grid = np.asarray(grid)
+    cols, rows = grid.shape
+    gx, gy = goal
+    if not (0 <= gx < cols and 0 <= gy < rows):
+        return []
+
+    passable = passable_mask(grid, allow_unknown)
+    n = cols * rows
+    start_i = start[0] * rows + start[1]
+    goal_i = gx * rows + gy
+
+    moves = NEIGHBORS + DIAGONALS if diagonal else NEIGHBORS
+    offsets = [i * rows + j for i, j in moves]
+
+    if diagonal:
+        g_score = np.full(n, np.inf)
+    else:
+        g_score = np.full(n, np.iinfo(np.int32).max, dtype=np.int32)
+    came_from = np.zeros(n, dtype=np.uint8)
+    closed = np.zeros(n, dtype=bool)
+
+    g_score[start_i] = 0
+    oheap = [(octile(start, goal) if diagonal else heuristic(start, goal), start_i)]
+
+    while oheap:
+        current = heapq.heappop(oheap)[1]
+        if closed[current]:
+            continue # Eski (stale) kayıt
+        if current == goal_i:
+            break
+        closed[current] = True
+
+        cx, cy = divmod(current, rows)
+        g_current = float(g_score[current]) if diagonal else int(g_score[current])
+        g_straight, g_diagonal = g_current + 1, g_current + SQRT2
+        for k, (i, j) in enumerate(moves):
+            nx, ny = cx + i, cy + j
+            if not (0 <= nx < cols and 0 <= ny < rows):
+                continue
+            neighbor = nx * rows + ny
+            if not passable[neighbor] or closed[neighbor]:
+                continue
+            if k < 4:
+                g_next = g_straight
+            elif passable[nx * rows + cy] and passable[cx * rows + ny]:
+                g_next = g_diagonal
+            else:
+                continue # Köşe kesilmez
+            if g_next < g_score[neighbor]:
+                g_score[neighbor] = g_next
+                came_from[neighbor] = k
+                h_next = abs(nx - gx) + abs(ny - gy)
+                if diagonal: # Oktil: Her çapraz adım iki düz adımın yerine geçer
+                    h_next -= (2 - SQRT2) * min(abs(nx - gx), abs(ny - gy))
+                heapq.heappush(oheap, (g_next + h_next, neighbor))
+    else:
+        return []
+
+    data = []
+    while current != start_i:
+        data.append(divmod(current, rows))
+        current -= offsets[came_from[current]]
+    return data[::-1]
+
+def next_stop(marker, axis, step):
+    """
+    Her kareden axis boyunca step (+1 / -1) yönünde ilk marker karesinin o
+    eksendeki indeksi (karenin kendisi hariç); yoksa harita dışı (-1 ya da boyut).
+    """
+    marker = np.moveaxis(marker, axis, -1)
+    length = marker.shape[-1]
+    pos = np.arange(length)
+    if step > 0:
+        idx = np.where(marker, pos, length)
+        idx = np.minimum.accumulate(idx[..., ::-1], axis=-1)[..., ::-1]
+        out = np.full_like(idx, length)
+        out[..., :-1] = idx[..., 1:]
+    else:
+        idx = np.where(marker, pos, -1)
+        idx = np.maximum.accumulate(idx, axis=-1)
+        out = np.full_like(idx, -1)
+        out[..., 1:] = idx[..., :-1]
+    return np.moveaxis(out, -1, axis)
+
+def jump_table(stop, free_map, axis, step):
+    """
+    Her kareden axis boyunca step yönünde düz sıçramanın vardığı stop
+    karesinin o eksendeki indeksi; araya geçilemez kare ya da harita kenarı
+    girerse -1.
+    """
+    hits = next_stop(stop | ~free_map, axis, step)
+    length = stop.shape[axis]
+    inside = (hits >= 0) & (hits < length)
+    found = inside & np.take_along_axis(stop, np.clip(hits, 0, length - 1), axis)
+    return np.where(found, hits, -1)
+
+def jump_point_search(grid, start, goal, allow_unknown=False, diagonal=False):
+    """
+    Jump Point Search (Harabor & Grastien). Tekdüze maliyetli ızgarada A*'ın
+    eşit maliyetli simetrik yollarını budar: Bir doğrultuda, yön değiştirmek
+    gereken (zorunlu komşusu olan) kareye kadar 'atlanır'; açık listeye
+    sadece bu sıçrama noktaları (jump point) girer. Yol maliyeti
+    a_star_search ile aynıdır (aynı diagonal ayarıyla).
+    diagonal=False: 4 komşuluk. Yatay ilerlerken her karede dikey dallar
+    denenir; dikey ilerleme sadece zorunlu komşuda yatay yöne döner.
+    diagonal=True : 8 komşuluk, oktil sezgisel; köşe kesilmez.
+    Dönen yol (ara kareler dahil) a_star_search ile aynı biçimdedir.
+    """
+    grid = np.asarray(grid)
+    cols, rows = grid.shape
+    start, goal = tuple(start), tuple(goal)
+    free_map = passable_mask(grid, allow_unknown).reshape(cols, rows)
+    passable = free_map.ravel().tolist()
+
+    def free(x, y):
+        return 0 <= x < cols and 0 <= y < rows and passable[x * rows + y]
+
+    if not free(*goal):
+        return []
+
+    # Düz sıçramalar tablodan okunur: Her yön için, her kareden o yönde
+    # ilk durulacak (zorunlu komşulu, hedef ya da geçilemez) kare vektörel bulunur
+    padded = np.zeros((cols + 2, rows + 2), dtype=bool)
+    padded[1:-1, 1:-1] = free_map
+    def free_at(dx, dy): # free(x + dx, y + dy), tüm kareler için
+        return padded[1 + dx:cols + 1 + dx, 1 + dy:rows + 1 + dy]
+
+    goal_mask = np.zeros((cols, rows), dtype=bool)
+    goal_mask[goal] = True
+    stops = {}
+    for dy in (1, -1):
+        forced = (free_at(1, 0) & ~free_at(1, -dy)) | (free_at(-1, 0) & ~free_at(-1, -dy))
+        stops[(0, dy)] = (forced | goal_mask) & free_map
+    if not diagonal:
+        # 4 komşulukta yatay ilerleme, dikey dallardan biri bir nokta bulunca durur
+        found = np.zeros((cols, rows), dtype=bool)
+        for dy in (1, -1):
+            found |= jump_table(stops[(0, dy)], free_map, 1, dy) >= 0
+    for dx in (1, -1):
+        if diagonal:
+            forced = (free_at(0, 1) & ~free_at(-dx, 1)) | (free_at(0, -1) & ~free_at(-dx, -1))
+        else:
+            forced = found
+        stops[(dx, 0)] = (forced | goal_mask) & free_map
+
+    tables = {}
+    for (dx, dy), stop in stops.items():
+        axis, step = (0, dx) if dx else (1, dy)
+        tables[(dx, dy)] = jump_table(stop, free_map, axis, step).ravel().tolist()
+
+    def jump_straight(x, y, dx, dy):
+        point = tables[(dx, dy)][x * rows + y]
+        if point < 0:
+            return None
+        return (point, y) if dx else (x, point)
+
+    def jump_diagonal(x, y, dx, dy):
+        while free(x + dx, y) and free(x, y + dy): # Köşe kesilmez
+            x += dx
+            y += dy
+            if not free(x, y):
+                return None
+            if (x, y) == goal or jump_straight(x, y, dx, 0) or jump_straight(x, y, 0, dy):
+                return x, y
+        return None
+
+    def directions(node, parent):
+        """Budanmış yönler: Geliş yönüne göre doğal ve zorunlu komşular."""
+        if parent is None:
+            return NEIGHBORS + DIAGONALS if diagonal else NEIGHBORS
+        x, y = node
+        dx = (x > parent[0]) - (x < parent[0])
+        dy = (y > parent[1]) - (y < parent[1])
+        if dx and dy:
+            return [(dx, 0), (0, dy), (dx, dy)]
+        if dx:
+            if not diagonal:
+                return [(dx, 0), (0, 1), (0, -1)]
+            dirs = [(dx, 0)]
+            for s in (1, -1):
+                if free(x, y + s) and not free(x - dx, y + s):
+                    dirs += [(0, s), (dx, s)]
+            return dirs
+        dirs = [(0, dy)]
+        for s in (1, -1):
+            if free(x + s, y) and not free(x + s, y - dy):
+                dirs.append((s, 0))
+                if diagonal:
+                    dirs.append((s, dy))
+        return dirs
+
+    h = octile if diagonal else heuristic
+    g_score = {start: 0}
+    came_from = {start: None}
+    closed = set()
+    oheap = [(h(start, goal), start)]
+
+    while oheap:
+        current = heapq.heappop(oheap)[1]
+        if current in closed:
+            continue # Eski (stale) kayıt
+        if current == goal:
+            break
+        closed.add(current)
+
+        for dx, dy in directions(current, came_from[current]):
+            if dx and dy:
+                point = jump_diagonal(current[0], current[1], dx, dy)
+            else:
+                point = jump_straight(current[0], current[1], dx, dy)
+            if point is None or point in closed:
+                continue
+            g_next = g_score[current] + h(current, point) # İki nokta arası tek doğrultu
+            if g_next < g_score.get(point, math.inf):
+                g_score[point] = g_next
+                came_from[point] = current
+                heapq.heappush(oheap, (g_next + h(point, goal), point))
+    else:
+        return []
+
+    # Sıçrama noktaları arasındaki kareler yola açılır
+    points = []
+    while current is not None:
+        points.append(current)
+        current = came_from[current]
+    points.reverse()
+    data = []
+    for (x, y), (bx, by) in zip(points, points[1:]):
+        dx, dy = (bx > x) - (bx < x), (by > y) - (by < y)
+        while (x, y) != (bx, by):
+            x += dx
+            y += dy
+            data.append((x, y))
+    return data
+
+def reachable_mask(grid, start, allow_unknown=True):
+    """
+    start karesinden 4 komşulukla ulaşılabilen kareler (flood fill, BFS).
+    Varsayılan olarak bilinmeyen kareler de geçilebilir sayılır: robotun
+    henüz görmediği ama duvarla kapanmamış her yer ulaşılabilir olabilir.
+    Dönen değer grid ile aynı şekilde bir bool dizisidir.
+    """
+    grid = np.asarray(grid)
+    cols, rows = grid.shape
+    passable = passable_mask(grid, allow_unknown)
+    visited = np.zeros(cols * rows, dtype=bool)
+
+    start_i = start[0] * rows + start[1]
+    if passable[start_i]:
+        visited[start_i] = True
+        queue = deque([start_i])
+        while queue:
+            current = queue.popleft()
+            cx, cy = divmod(current, rows)
+            for i, j in NEIGHBORS:
+                nx, ny = cx + i, cy + j
+                if not (0 <= nx < cols and 0 <= ny < rows):
+                    continue
+                neighbor = nx * rows + ny
+                if passable[neighbor] and not visited[neighbor]:
+                    visited[neighbor] = True
+                    queue.append(neighbor)
+    return visited.reshape(cols, rows)
+
+def tree_path(came_from, start, goal):
+    """
+    Ebeveyn yönü ağacından (came_from, NEIGHBORS indeksi, grid ile aynı şekil)
+    start -> goal yolu. Yol başlangıcı içermez, hedefi içerir.
+    """
+    data = []
+    node = tuple(goal)
+    start = tuple(start)
+    while node != start:
+        data.append(node)
+        i, j = NEIGHBORS[came_from[node]]
+        node = (node[0] - i, node[1] - j)
+    return data[::-1]
+
+class DistanceField:
+    """
+    Robotun karesinden bütün haritaya BFS mesafe ve ebeveyn (NEIGHBORS
+    indeksi) alanı. Alan, kurulduğu başlangıç karesi ve harita sürümüyle
+    (World.version) önbelleğe alınır: Robot kare değiştirmedikçe ve harita
+    değişmedikçe her tıklamanın yolu yeni arama yapmadan ebeveynler
+    izlenerek çıkarılır.
+    Sensör sadece yeni geçilebilir kareler açtıysa (allow_unknown=False,
+    kod2-kod3) alan bu karelerden onarılır; geçilebilir bir kare kapandıysa
+    (allow_unknown=True iken görülen duvar) alan bir sonraki sorguda
+    baştan kurulur.
+    """
+    def __init__(self, grid, allow_unknown=False):
+        self.grid = grid # Canlı referans (robotun hafızası)
+        self.cols, self.rows = grid.shape
+        self.allow_unknown = allow_unknown
+        self.origin = None  # Alanın kurulduğu kare (None: geçersiz)
+        self.version = None # Alanın yansıttığı harita sürümü
+        self.passable = None
+        self.dist = None
+        self.came_from = None
+
+    def build(self, origin, version):
+        """origin'den BFS ile alanı baştan kurar."""
+        cols, rows = self.cols, self.rows
+        self.passable = passable_mask(self.grid, self.allow_unknown).copy()
+        self.dist = np.full(cols * rows, -1, dtype=np.int32)
+        self.came_from = np.zeros(cols * rows, dtype=np.uint8)
+        self.origin, self.version = origin, version
+
+        start_i = origin[0] * rows + origin[1]
+        self.dist[start_i] = 0
+        queue = deque([start_i])
+        self.propagate(queue)
+
+    def propagate(self, queue, seeds=()):
+        """
+        Kuyruktaki karelerden mesafeleri yayar (sadece kısalan mesafeler
+        güncellenir). seeds: mesafeye göre sıralı ek başlangıç kareleri;
+        kuyrukla mesafe sırasında birleştirilir, böylece kareler artan
+        mesafe sırasıyla açılır ve her kare bir kez yayılır.
+        """
+        cols, rows = self.cols, self.rows
+        passable, dist, came_from = self.passable, self.dist, self.came_from
+        seeds = deque(seeds)
+        while queue or seeds:
+            if seeds and (not queue or dist[seeds[0]] <= dist[queue[0]]):
+                current = seeds.popleft()
+            else:
+                current = queue.popleft()
+            cx, cy = divmod(current, rows)
+            d_next = int(dist[current]) + 1
+            for d, (i, j) in enumerate(NEIGHBORS):
+                nx, ny = cx + i, cy + j
+                if not (0 <= nx < cols and 0 <= ny < rows):
+                    continue
+                neighbor = nx * rows + ny
+                if passable[neighbor] and (dist[neighbor] < 0 or dist[neighbor] > d_next):
+                    dist[neighbor] = d_next
+                    came_from[neighbor] = d
+                    queue.append(neighbor)
+
+    def update(self, revealed, version):
+        """Sensörün açtığı kareleri (revealed = (xs, ys)) alana işler."""
+        if self.origin is None:
+            return
+        xs, ys = revealed
+        if len(xs) == 0:
+            self.version = version # Değişen kare yok, alan hâlâ geçerli
+            return
+        now_passable = passable_mask(self.grid[xs, ys], self.allow_unknown)
+        flat = xs * self.rows + ys
+        if (self.passable[flat] & ~now_passable).any():
+            self.origin = None # Kapanan kare: Alan baştan kurulacak
+            return
+
+        opened = flat[now_passable & ~self.passable[flat]]
+        self.passable[opened] = True
+        self.version = version
+        if len(opened) == 0:
+            return
+
+        # Yeni karelere, alana bağlı komşularından bir sonraki adımda ulaşılır;
+        # kısalan mesafeler komşulara yayılır
+        rows = self.rows
+        seeds = set()
+        for cell in opened.tolist():
+            cx, cy = divmod(cell, rows)
+            for i, j in NEIGHBORS:
+                nx, ny = cx + i, cy + j
+                if 0 <= nx < self.cols and 0 <= ny < rows and self.dist[nx * rows + ny] >= 0:
+                    seeds.add(nx * rows + ny)
+        # Tohumların mesafeleri farklıdır: Tek bir kuyruğa eklenirlerse yakın
+        # tohumdan yayılan kareler uzak tohumların arkasına düşer. Sıralı
+        # tohumlar kuyrukla mesafe sırasında birleştirilir (bkz. propagate).
+        self.propagate(deque(), sorted(seeds, key=lambda i: self.dist[i]))
+
+    def path(self, start, goal, version):
+        """
+        start -> goal yolu (başlangıç hariç, hedef dahil); yol yoksa [].
+        Alan start karesinden ve bu harita sürümüyle kurulmadıysa yeniden kurulur.
+        """
+        start, goal = tuple(start), tuple(goal)
+        if start != self.origin or version != self.version:
+            self.build(start, version)
+        if self.dist[goal[0] * self.rows + goal[1]] < 0:
+            return []
+        return tree_path(self.came_from.reshape(self.cols, self.rows), start, goal)
+
+class DStarLite:
+    """
+    Artımlı yeniden planlama (D* Lite, Koenig & Likhachev).
+    Arama hedeften başlangıca doğru yapılır; g / rhs değerleri ve öncelik
+    kuyruğu çağrılar arasında saklanır. Sensör bir karenin geçilebilirliğini
+    değiştirdiğinde (update) sadece o kare ve komşuları yeniden değerlendirilir;
+    plan() tüm haritayı baştan aramadan yolu onarır.
+    allow_unknown=True: Bilinmeyen kareler geçilebilir varsayılır (iyimser
+    planlama); sonradan görülen duvarlar yolu onarır.
+    """
+    def __init__(self, grid, start, goal, allow_unknown=True):
+        grid = np.asarray(grid)
+        self.cols, self.rows = grid.shape
+        self.allow_unknown = allow_unknown
+        self.passable = passable_mask(grid, allow_unknown).tolist()
+
+        n = self.cols * self.rows
+        # Tek tek erişildiği için Python listeleri NumPy'den hızlıdır
+        self.g = [math.inf] * n
+        self.rhs = [math.inf] * n
+        self.queue = []
+        self.queued = {} # kare -> kuyruktaki geçerli anahtar (eski kayıtlar atlanır)
+        self.km = 0
+
+        self.start = start[0] * self.rows + start[1]
+        self.last = self.start
+        self.goal = goal[0] * self.rows + goal[1]
+        self.rhs[self.goal] = 0
+        self.push(self.goal)
+
+    def heuristic(self, a, b):
+        ax, ay = divmod(a, self.rows)
+        bx, by = divmod(b, self.rows)
+        return abs(ax - bx) + abs(ay - by)
+
+    def neighbors(self, u):
+        x, y = divmod(u, self.rows)
+        for i, j in NEIGHBORS:
+            nx, ny = x + i, y + j
+            if 0 <= nx < self.cols and 0 <= ny < self.rows:
+                yield nx * self.rows + ny
+
+    def cost(self, u, v):
+        return 1 if self.passable[u] and self.passable[v] else math.inf
+
+    def key(self, u):
+        m = min(self.g[u], self.rhs[u])
+        return (m + self.heuristic(self.start, u) + self.km, m)
+
+    def push(self, u):
+        k = self.key(u)
+        self.queued[u] = k
+        heapq.heappush(self.queue, (k, u))
+
+    def update_vertex(self, u):
+        if u != self.goal:
+            self.rhs[u] = min((self.cost(u, s) + self.g[s] for s in self.neighbors(u)), default=math.inf)
+        if self.g[u] != self.rhs[u]:
+            self.push(u)
+        else:
+            self.queued.pop(u, None)
+
+    def compute(self):
+        """Başlangıç karesi tutarlı olana kadar kuyruğu işler."""
+        queue = self.queue
+        while queue:
+            k_old, u = queue[0]
+            if self.queued.get(u) != k_old:
+                heapq.heappop(queue) # Eski (stale) kayıt
+                continue
+            if not (k_old < self.key(self.start) or self.rhs[self.start] != self.g[self.start]):
+                break
+            heapq.heappop(queue)
+            k_new = self.key(u)
+            if k_old < k_new:
+                self.queued[u] = k_new
+                heapq.heappush(queue, (k_new, u))
+            elif self.g[u] > self.rhs[u]:
+                self.g[u] = self.rhs[u]
+                del self.queued[u]
+                for p in self.neighbors(u):
+                    self.update_vertex(p)
+            else:
+                self.g[u] = math.inf
+                del self.queued[u]
+                self.update_vertex(u)
+                for p in self.neighbors(u):
+                    self.update_vertex(p)
+
+    def update(self, grid, cells):
+        """
+        Sensörün değiştirdiği kareleri (cells = (xs, ys)) işler; geçilebilirliği
+        değişen kare varsa True döner (yolu plan() ile onarmak gerekir).
+        """
+        xs, ys = cells
+        if len(xs) == 0:
+            return False
+        now = passable_mask(np.asarray(grid)[xs, ys], self.allow_unknown)
+        changed = False
+        for x, y, value in zip(xs.tolist(), ys.tolist(), now.tolist()):
+            u = x * self.rows + y
+            if self.passable[u] == value:
+                continue
+            self.passable[u] = value
+            changed = True
+            self.update_vertex(u)
+            for p in self.neighbors(u):
+                self.update_vertex(p)
+        return changed
+
+    def plan(self, start=None):
+        """
+        (Yeni) başlangıçtan hedefe yol; başlangıç hariç, hedef dahil.
+        Yol yoksa [].
+        """
+        if start is not None:
+            self.start = start[0] * self.rows + start[1]
+            self.km += self.heuristic(self.last, self.start)
+            self.last = self.start
+        self.compute()
+        if self.g[self.start] == math.inf:
+            return []
+
+        data = []
+        current = self.start
+        while current != self.goal:
+            current = min(self.neighbors(current), key=lambda s: self.cost(current, s) + self.g[s])
+            if self.g[current] == math.inf or len(data) > len(self.g):
+                return []
+            data.append(divmod(current, self.rows))
+        return data
@@ -0,0 +1,87 @@
+import numpy as np
+from planner import VAL_UNKNOWN, VAL_WALL
+
+def label_regions(mask, diagonal=False):
+    """
+    mask içindeki 4 komşulukla (diagonal=True: 8 komşulukla) bağlı bölgeleri
+    etiketler (Python döngüsü yok).
+    Her sütundaki (aynı x) ardışık True kareler bir 'koşu' (run) olur;
+    komşu sütunlarda yan yana gelen koşular birleşim-bul (union-find)
+    ile birleştirilir. Kökler, etiket yayma + işaretçi atlama ile bulunur.
+    Dönen değer (labels, count): labels int32, bölge dışı -1, bölgeler 0..count-1.
+    """
+    mask = np.asarray(mask, dtype=bool)
+    cols, rows = mask.shape
+    labels = np.full(mask.shape, -1, dtype=np.int32)
+    flat = mask.ravel()
+    if not flat.any():
+        return labels, 0
+
+    # Koşu başlangıçları: y = 0'da veya bir üstü False olan True kareler
+    starts = flat.copy()
+    starts[1:] &= ~flat[:-1]
+    starts[::rows] = flat[::rows]
+    run_id = np.cumsum(starts, dtype=np.int32) - 1
+    run_id = np.where(flat, run_id, -1).reshape(cols, rows)
+    n_runs = int(starts.sum())
+
+    # Yatay komşu koşular (x, x + 1) -> birleştirilecek kenarlar
+    touching = mask[:-1] & mask[1:]
+    a = run_id[:-1][touching]
+    b = run_id[1:][touching]
+    if diagonal:
+        # Çapraz komşular: (x, y) - (x + 1, y + 1) ve (x, y + 1) - (x + 1, y)
+        down = mask[:-1, :-1] & mask[1:, 1:]
+        up = mask[:-1, 1:] & mask[1:, :-1]
+        a = np.concatenate([a, run_id[:-1, :-1][down], run_id[:-1, 1:][up]])
+        b = np.concatenate([b, run_id[1:, 1:][down], run_id[1:, :-1][up]])
+    # Aynı iki koşu birçok satırda yan yana olabilir; kenarlar tekilleştirilir
+    edges = np.unique(a.astype(np.int64) * n_runs + b)
+    a, b = (edges // n_runs).astype(np.int32), (edges % n_runs).astype(np.int32)
+
+    parent = np.arange(n_runs, dtype=np.int32)
+    while True:
+        low = np.minimum(parent[a], parent[b])
+        new_parent = parent.copy()
+        np.minimum.at(new_parent, parent[a], low)
+        np.minimum.at(new_parent, parent[b], low)
+        # İşaretçi atlama: her koşu kökünün köküne bağlanır
+        while True:
+            jumped = new_parent[new_parent]
+            if np.array_equal(jumped, new_parent):
+                break
+            new_parent = jumped
+        if np.array_equal(new_parent, parent):
+            break
+        parent = new_parent
+
+    roots, compact = np.unique(parent, return_inverse=True)
+    labels[mask] = compact.astype(np.int32)[run_id[mask]]
+    return labels, len(roots)
+
+def finalize_unknown(known_map):
+    """
+    Keşif bittiğinde kalan 'Bilinmeyen' bölgeleri sınıflandırır.
+    - Her tarafı duvarla çevrili bölgeler (blokların içi): Duvar (0) yapılır.
+    - Harita kenarına ya da bilinmeyene açılan boş karelere (robotun
+      ulaşamadığı cepler) değen bölgeler: keşfedilmemiş olarak bırakılır.
+    known_map yerinde güncellenir; keşfedilmemiş kareler bool maske olarak döner.
+    """
+    unknown = known_map == VAL_UNKNOWN
+    labels, count = label_regions(unknown)
+    if count == 0:
+        return unknown
+
+    open_region = np.zeros(count, dtype=bool)
+    # Harita kenarına değen bölgeler
+    for edge in (labels[0], labels[-1], labels[:, 0], labels[:, -1]):
+        open_region[edge[edge >= 0]] = True
+    # Duvar olmayan bilinen bir kareye değen bölgeler
+    seen_open = (known_map != VAL_WALL) & ~unknown
+    for here, there in ((np.s_[:-1], np.s_[1:]), (np.s_[1:], np.s_[:-1])):
+        for lab, other in ((labels[here], seen_open[there]), (labels[:, here], seen_open[:, there])):
+            open_region[lab[other & (lab >= 0)]] = True
+
+    enclosed = unknown & ~open_region[labels]
+    known_map[enclosed] = VAL_WALL
+    return unknown & ~enclosed
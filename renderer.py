@@ -0,0 +1,84 @@
+import numpy as np
+import pygame
+from planner import VAL_FREE
+
+class MapRenderer:
+    """
+    Bilinen haritayı kalıcı bir yüzeyde (surface) tutar.
+    Her karede tüm hücreler yeniden çizilmez; sadece sensörün (veya
+    bitiş adımının) değiştirdiği bölge palet üzerinden renge çevrilip
+    tek bir surfarray işlemiyle yüzeye basılır.
+    """
+    def __init__(self, known_map, cell_size, palette, line_color=(255, 255, 255), line_values=(VAL_FREE,)):
+        """
+        palette    : {durum_kodu: (r, g, b)}
+        line_color : Izgara çizgisi rengi (None ise çizgi yok)
+        line_values: Izgara çizgisi çizilecek durum kodları
+        """
+        cols, rows = known_map.shape
+        self.cell_size = cell_size
+        self.surface = pygame.Surface((cols * cell_size, rows * cell_size))
+
+        self.palette = np.zeros((256, 3), dtype=np.uint8)
+        for val, color in palette.items():
+            self.palette[val] = color
+
+        self.line_color = line_color
+        self.line_values = np.array(line_values)
+        # Tek hücrenin 1 piksellik kenarlığı (pygame.draw.rect(..., 1) ile aynı)
+        self.edge = np.zeros((cell_size, cell_size), dtype=bool)
+        self.edge[[0, -1], :] = True
+        self.edge[:, [0, -1]] = True
+
+        self.dirty = None # Henüz boyanmamış bölge (x0, x1, y0, y1)
+        self.redraw(known_map)
+
+    def redraw(self, known_map):
+        """Haritanın tamamını yeniden boyar."""
+        cols, rows = known_map.shape
+        self.update_region(known_map, 0, cols, 0, rows)
+
+    def update(self, known_map, changed):
+        """Değişen karelerin (changed = (xs, ys)) kapsadığı dikdörtgeni boyar."""
+        xs, ys = changed
+        if len(xs) == 0:
+            return
+        self.update_region(known_map, int(xs.min()), int(xs.max()) + 1, int(ys.min()), int(ys.max()) + 1)
+
+    def mark(self, changed):
+        """
+        Değişen kareleri kirli bölgeye ekler; boyama flush ile tek seferde
+        yapılır (bir karede birden fazla simülasyon adımı çalıştığında).
+        """
+        xs, ys = changed
+        if len(xs) == 0:
+            return
+        box = (int(xs.min()), int(xs.max()) + 1, int(ys.min()), int(ys.max()) + 1)
+        if self.dirty is not None:
+            box = (min(box[0], self.dirty[0]), max(box[1], self.dirty[1]),
+                   min(box[2], self.dirty[2]), max(box[3], self.dirty[3]))
+        self.dirty = box
+
+    def flush(self, known_map):
+        """Kirli bölgeyi boyar."""
+        if self.dirty is not None:
+            self.update_region(known_map, *self.dirty)
+            self.dirty = None
+
+    def update_region(self, known_map, x0, x1, y0, y1):
+        c = self.cell_size
+        cells = known_map[x0:x1, y0:y1]
+
+        # Hücre -> Renk (palet), sonra hücreyi c x c piksele genişlet
+        pixels = self.palette[cells].repeat(c, axis=0).repeat(c, axis=1)
+
+        if self.line_color is not None:
+            lined = np.isin(cells, self.line_values).repeat(c, axis=0).repeat(c, axis=1)
+            lined &= np.tile(self.edge, cells.shape)
+            pixels[lined] = self.line_color
+
+        region = self.surface.subsurface((x0 * c, y0 * c, (x1 - x0) * c, (y1 - y0) * c))
+        pygame.surfarray.blit_array(region, pixels)
+
+    def draw(self, win, pos=(0, 0)):
+        win.blit(self.surface, pos)
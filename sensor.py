@@ -0,0 +1,47 @@
+import numpy as np
+from planner import VAL_UNKNOWN
+
+def sense_window(real_map, known_map, cx, cy, view_range):
+    """
+    (cx, cy) merkezli, view_range yarıçaplı kare pencereyi harita sınırlarına
+    kırparak tek bir NumPy dilimiyle gerçek haritadan hafızaya kopyalar.
+    Dönen değer (xs, ys): 'Bilinmeyen' iken bu taramada açılan karelerin
+    koordinatları. Sınır, kapsama ve çizim güncellemeleri bu farkı kullanır.
+    """
+    cols, rows = known_map.shape
+    x0, x1 = max(cx - view_range, 0), min(cx + view_range + 1, cols)
+    y0, y1 = max(cy - view_range, 0), min(cy + view_range + 1, rows)
+    if x0 >= x1 or y0 >= y1:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+
+    window = known_map[x0:x1, y0:y1]
+    xs, ys = np.nonzero(window == VAL_UNKNOWN)
+    window[...] = real_map[x0:x1, y0:y1]
+    return xs + x0, ys + y0
+
+def window_mask(mask, view_range):
+    """
+    mask içindeki herhangi bir kareden sensör penceresiyle (view_range
+    yarıçaplı kare) görülebilen kareler. Pencere toplamı 2B kümülatif toplamla
+    (cumsum) hesaplanır; maliyet view_range'den bağımsızdır.
+    """
+    mask = np.asarray(mask, dtype=bool)
+    cols, rows = mask.shape
+    # Sol ve üstte bir satır sıfırla genişletilmiş 2B önek toplamı
+    prefix = np.zeros((cols + 1, rows + 1), dtype=np.int32)
+    prefix[1:, 1:] = mask.cumsum(axis=0, dtype=np.int32).cumsum(axis=1)
+
+    x0 = np.clip(np.arange(cols) - view_range, 0, cols)
+    x1 = np.clip(np.arange(cols) + view_range + 1, 0, cols)
+    y0 = np.clip(np.arange(rows) - view_range, 0, rows)
+    y1 = np.clip(np.arange(rows) + view_range + 1, 0, rows)
+    total = (prefix[np.ix_(x1, y1)] - prefix[np.ix_(x0, y1)]
+             - prefix[np.ix_(x1, y0)] + prefix[np.ix_(x0, y0)])
+    return total > 0
+
+def window_count(grid, cx, cy, view_range, value):
+    """(cx, cy) merkezli sensör penceresinde (harita sınırına kırpılmış) value olan kare sayısı."""
+    cols, rows = grid.shape
+    x0, x1 = max(cx - view_range, 0), min(cx + view_range + 1, cols)
+    y0, y1 = max(cy - view_range, 0), min(cy + view_range + 1, rows)
+    return int(np.count_nonzero(grid[x0:x1, y0:y1] == value))
@@ -0,0 +1,40 @@
+import pygame
+
+class SimClock:
+    """
+    Sabit adımlı simülasyon saati.
+    Çizilen her karede K (steps_per_frame) simülasyon adımı (hareket, sensör,
+    düşünme) çalıştırılır; ekran ise sadece 'fps' hızında çizilir.
+    Robot hızı adım başına tanımlı olduğu için fizik FPS'e bağlı değildir.
+    '+' / '-' tuşları K'yı ikiye katlar / yarıya indirir.
+    """
+    MAX_STEPS = 256
+
+    def __init__(self, fps=60, steps_per_frame=1):
+        self.fps = fps
+        self.steps_per_frame = steps_per_frame
+        self.clock = pygame.time.Clock()
+
+    def tick(self):
+        """Çizim hızını (FPS) sınırlar."""
+        return self.clock.tick(self.fps)
+
+    def steps(self):
+        """Bu karede çalıştırılacak simülasyon adımları."""
+        return range(self.steps_per_frame)
+
+    def handle_event(self, event):
+        """Hız tuşlarını işler; olay bu saate aitse True döndürür."""
+        if event.type != pygame.KEYDOWN:
+            return False
+        if event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+            self.steps_per_frame = min(self.steps_per_frame * 2, self.MAX_STEPS)
+        elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+            self.steps_per_frame = max(self.steps_per_frame // 2, 1)
+        else:
+            return False
+        print(f"Simülasyon hızı: {self.steps_per_frame} adım/kare")
+        return True
+
+    def label(self):
+        return f"Hız: x{self.steps_per_frame} (+/-)"
@@ -0,0 +1,29 @@
+import numpy as np
+from planner import VAL_FREE, VAL_UNKNOWN, VAL_WALL
+from frontier import FrontierIndex
+
+def corridor():
+    """
+    10x3 harita: y = 1 satırı boş bir koridor, üstü ve altı bilinmeyen.
+    Koridorun her karesi sınır karesidir.
+    """
+    grid = np.full((10, 3), VAL_UNKNOWN, dtype=np.uint8)
+    grid[:, 1] = VAL_FREE
+    grid[0, 1] = grid[9, 1] = VAL_WALL
+    index = FrontierIndex(*grid.shape)
+    index.update(grid, np.nonzero(grid != VAL_UNKNOWN))
+    return grid, index
+
+def test_expand_skips_only_the_start_cell():
+    """Başlangıç karesi sınır olsa da hedef verilmez; hemen yanındaki sınır karesi verilir."""
+    grid, index = corridor()
+    assert (4, 1) in index
+    targets = [(cell, dist) for cell, dist, _ in index.expand(grid, (4, 1), allow_unknown=False, claim_range=2)]
+    assert (4, 1) not in [cell for cell, _ in targets]
+    assert targets[:2] == [((5, 1), 1), ((3, 1), 1)]
+
+def test_expand_skips_cells_near_claimed_targets():
+    """claimed karelerine claim_range mesafesindeki sınırlar atlanır."""
+    grid, index = corridor()
+    cells = [cell for cell, _, _ in index.expand(grid, (1, 1), allow_unknown=False, claimed=[(6, 1)], claim_range=1)]
+    assert cells == [(2, 1), (3, 1), (4, 1), (8, 1)]
@@ -0,0 +1,35 @@
+import threading
+from plan_worker import PlanWorker
+
+def wait_idle(worker):
+    """İş parçacığı işi bitirene kadar bekler (sonucu okumadan)."""
+    while worker.busy:
+        threading.Event().wait(0.001)
+
+def test_try_submit_keeps_unread_result():
+    """poll()'dan sonra biten işin sonucu, try_submit ile atılmaz."""
+    worker = PlanWorker()
+    try:
+        assert worker.try_submit(1, lambda: "ilk")
+        wait_idle(worker)
+        assert not worker.try_submit(2, lambda: "ikinci")
+        assert worker.poll() == (1, "ilk")
+        assert worker.try_submit(2, lambda: "ikinci")
+        wait_idle(worker)
+        assert worker.poll() == (2, "ikinci")
+    finally:
+        worker.stop()
+
+def test_submit_supersedes_pending_job():
+    """submit, çalışan işin sonucunu geçersiz kılar; sadece son işin sonucu alınır."""
+    worker = PlanWorker()
+    release = threading.Event()
+    try:
+        worker.submit(1, release.wait)
+        worker.submit(2, lambda: "son")
+        release.set()
+        wait_idle(worker)
+        assert worker.poll() == (2, "son")
+        assert worker.poll() is None
+    finally:
+        worker.stop()
@@ -0,0 +1,127 @@
+import math
+import numpy as np
+import pytest
+from planner import (VAL_WALL, VAL_FREE, VAL_UNKNOWN, NEIGHBORS, DIAGONALS, passable_mask, path_cost,
+                     a_star_search, jump_point_search, DStarLite, DistanceField)
+from sensor import sense_window
+
+# Rastgele haritalar tohumludur; her koşu aynı sorguları dener
+SEED = 2024
+
+def random_grid(rng, cols, rows, wall_ratio):
+    """wall_ratio oranında rastgele duvarlı harita."""
+    return np.where(rng.random((cols, rows)) < wall_ratio, VAL_WALL, VAL_FREE).astype(np.uint8)
+
+def random_cell(rng, grid):
+    cols, rows = grid.shape
+    return int(rng.integers(cols)), int(rng.integers(rows))
+
+def assert_valid_path(grid, start, goal, path, allow_unknown=False, diagonal=False):
+    """Yol, start'tan goal'e geçilebilir karelerden komşu adımlarla gider; çaprazda köşe kesilmez."""
+    cols, rows = grid.shape
+    passable = passable_mask(grid, allow_unknown).reshape(cols, rows)
+    steps = NEIGHBORS + DIAGONALS if diagonal else NEIGHBORS
+    assert path[-1] == goal
+    prev = start
+    for cell in path:
+        dx, dy = cell[0] - prev[0], cell[1] - prev[1]
+        assert (dx, dy) in steps
+        assert passable[cell]
+        if dx and dy:
+            assert passable[prev[0] + dx, prev[1]] and passable[prev[0], prev[1] + dy]
+        prev = cell
+
+# --- JUMP POINT SEARCH ---
+
+@pytest.mark.parametrize("diagonal", [False, True])
+@pytest.mark.parametrize("wall_ratio", [0.1, 0.3])
+def test_jump_point_search_matches_a_star_cost(diagonal, wall_ratio):
+    """JPS, A* ile aynı maliyette geçerli bir yol bulur; A* yol bulamıyorsa JPS de bulamaz."""
+    rng = np.random.default_rng(SEED)
+    for _ in range(40):
+        grid = random_grid(rng, int(rng.integers(5, 40)), int(rng.integers(5, 40)), wall_ratio)
+        for _ in range(10):
+            start, goal = random_cell(rng, grid), random_cell(rng, grid)
+            expected = a_star_search(grid, start, goal, diagonal=diagonal)
+            path = jump_point_search(grid, start, goal, diagonal=diagonal)
+            if not expected:
+                assert path == []
+                continue
+            assert_valid_path(grid, start, goal, path, diagonal=diagonal)
+            assert math.isclose(path_cost(start, path), path_cost(start, expected))
+
+# --- MESAFE ALANI ---
+
+@pytest.mark.parametrize("allow_unknown", [False, True])
+def test_distance_field_repair_matches_a_star(allow_unknown):
+    """Sensör kareleri açtıkça onarılan (ya da yeniden kurulan) alanın yolları A* ile aynı uzunlukta kalır."""
+    rng = np.random.default_rng(SEED)
+    for _ in range(30):
+        real = random_grid(rng, int(rng.integers(5, 40)), int(rng.integers(5, 40)), 0.3)
+        known = np.full(real.shape, VAL_UNKNOWN, dtype=np.uint8)
+        start = random_cell(rng, real)
+        real[start] = known[start] = VAL_FREE
+        field = DistanceField(known, allow_unknown)
+        version = 0
+        for _ in range(30):
+            xs, ys = rng.integers(real.shape[0], size=15), rng.integers(real.shape[1], size=15)
+            new = known[xs, ys] == VAL_UNKNOWN
+            xs, ys = np.unique(np.stack([xs[new], ys[new]]), axis=1)
+            known[xs, ys] = real[xs, ys]
+            version += 1
+            field.update((xs, ys), version)
+
+            goal = random_cell(rng, real)
+            path = field.path(start, goal, version)
+            expected = a_star_search(known, start, goal, allow_unknown)
+            assert len(path) == len(expected)
+            if path:
+                assert_valid_path(known, start, goal, path, allow_unknown)
+
+# --- D* LITE ---
+
+def test_dstar_lite_matches_a_star_after_wall_insertions():
+    """Rastgele duvarlar eklenip yol onarıldıkça D* Lite yolu A* ile aynı uzunlukta kalır."""
+    rng = np.random.default_rng(SEED)
+    for _ in range(30):
+        grid = random_grid(rng, int(rng.integers(5, 30)), int(rng.integers(5, 30)), 0.2)
+        start, goal = random_cell(rng, grid), random_cell(rng, grid)
+        grid[start] = grid[goal] = VAL_FREE
+        planner = DStarLite(grid, start, goal)
+        for _ in range(15):
+            xs, ys = rng.integers(grid.shape[0], size=3), rng.integers(grid.shape[1], size=3)
+            grid[xs, ys] = VAL_WALL
+            grid[start] = grid[goal] = VAL_FREE
+            planner.update(grid, (xs, ys))
+
+            expected = a_star_search(grid, start, goal, allow_unknown=True)
+            path = planner.plan(start)
+            assert len(path) == len(expected)
+            if path:
+                assert_valid_path(grid, start, goal, path, allow_unknown=True)
+
+def test_dstar_lite_matches_a_star_while_exploring():
+    """
+    kod1 gibi: Bilinmeyen haritada iyimser planlanır, robot yolu yürürken
+    sensör duvarları açar. Her onarımda yol, hafızadaki A* yolu kadar uzundur.
+    """
+    rng = np.random.default_rng(SEED)
+    for _ in range(20):
+        real = random_grid(rng, int(rng.integers(10, 40)), int(rng.integers(10, 40)), 0.25)
+        known = np.full(real.shape, VAL_UNKNOWN, dtype=np.uint8)
+        start, goal = random_cell(rng, real), random_cell(rng, real)
+        real[start] = real[goal] = VAL_FREE
+        sense_window(real, known, start[0], start[1], 2)
+        planner = DStarLite(known, start, goal)
+        path = planner.plan(start)
+
+        while path:
+            start = path.pop(0)
+            revealed = sense_window(real, known, start[0], start[1], 2)
+            if planner.update(known, revealed):
+                path = planner.plan(start)
+                expected = a_star_search(known, start, goal, allow_unknown=True)
+                assert len(path) == len(expected)
+                if path:
+                    assert_valid_path(known, start, goal, path, allow_unknown=True)
+        assert start == goal or a_star_search(real, start, goal) == []
@@ -0,0 +1,108 @@
+import numpy as np
+from planner import VAL_UNKNOWN, VAL_FREE, VAL_WALL, reachable_mask
+from sensor import sense_window, window_mask
+
+class World:
+    """
+    Simülasyon dünyası: Boyutlar (kare), kare boyutu (piksel), gerçek harita
+    ve robotun hafızası (known_map). Pencere boyutundan bağımsızdır; robot,
+    sensör ve planlayıcı boyutları buradan okur.
+    """
+    # Ulaşılabilirlik kontrolü en fazla bu kadar adımda bir yapılır
+    COMPLETION_CHECK_EVERY = 30
+
+    def __init__(self, real_map, cell_size=20, known_map=None):
+        self.real_map = real_map
+        self.cols, self.rows = real_map.shape
+        self.cell_size = cell_size
+        if known_map is None:
+            known_map = np.full(real_map.shape, VAL_UNKNOWN, dtype=np.uint8)
+        self.known_map = known_map
+        # Harita sürümü: Hafıza her değiştiğinde artar; önbellekler (bkz.
+        # planner.DistanceField) bununla geçerliliklerini kontrol eder
+        self.version = 0
+        self.recount()
+        # Tamamlanma kontrolü kısıtlaması (bkz. exploration_finished)
+        self.steps_since_check = 0
+        self.checked_unknown = None
+
+    @property
+    def width(self):
+        """Dünyanın piksel genişliği"""
+        return self.cols * self.cell_size
+
+    @property
+    def height(self):
+        """Dünyanın piksel yüksekliği"""
+        return self.rows * self.cell_size
+
+    def in_bounds(self, x, y):
+        return 0 <= x < self.cols and 0 <= y < self.rows
+
+    def cell_of(self, px, py):
+        """Piksel konumunun bulunduğu kare"""
+        return int(px // self.cell_size), int(py // self.cell_size)
+
+    def cell_center(self, cell):
+        """Karenin merkezinin piksel konumu"""
+        return cell[0] * self.cell_size + self.cell_size // 2, cell[1] * self.cell_size + self.cell_size // 2
+
+    # --- KAPSAMA SAYAÇLARI ---
+    # Sensörün döndürdüğü yeni kareler (önceden bilinmeyen) ile güncellenir;
+    # böylece keşif oranı için her karede bütün harita taranmaz.
+
+    def recount(self):
+        """Sayaçları haritadan baştan hesaplar (hafızaya doğrudan yazıldıktan sonra çağrılır)."""
+        self.version += 1
+        self.unknown_count = int(np.count_nonzero(self.known_map == VAL_UNKNOWN))
+        self.free_count = int(np.count_nonzero(self.known_map == VAL_FREE))
+        self.wall_count = int(np.count_nonzero(self.known_map == VAL_WALL))
+
+    @property
+    def explored_ratio(self):
+        """Bilinen karelerin oranı (O(1))"""
+        return 1.0 - self.unknown_count / self.known_map.size
+
+    def sense(self, cx, cy, view_range):
+        """(cx, cy) karesinden tarama yapar; yeni açılan kareleri (xs, ys) döndürür."""
+        revealed = sense_window(self.real_map, self.known_map, cx, cy, view_range)
+        xs, ys = revealed
+        if len(xs):
+            free = int(np.count_nonzero(self.known_map[xs, ys] == VAL_FREE))
+            self.unknown_count -= len(xs)
+            self.free_count += free
+            self.wall_count += len(xs) - free
+            self.version += 1
+        return revealed
+
+    def observation_complete(self, cell, view_range):
+        """
+        Robotun cell karesinden ulaşabileceği bölgeden (bilinmeyen kareler
+        dahil) sensörle görülebilecek bilinmeyen kare kalmadıysa True.
+        Duvar bloklarının içinde kalan, hiçbir konumdan görülemeyen kareler
+        keşfin bitmesini engellemez.
+        """
+        if self.unknown_count == 0:
+            return True
+        if self.known_map[cell] == VAL_WALL:
+            return False # Duvar karesinden ulaşılabilirlik bilinemez
+        reachable = reachable_mask(self.known_map, cell)
+        observable = window_mask(reachable, view_range)
+        return not np.any(observable & (self.known_map == VAL_UNKNOWN))
+
+    def exploration_finished(self, cell, view_range, goal=1.0):
+        """
+        Keşif oranı goal'e ulaştıysa ya da görülebilecek bilinmeyen kare
+        kalmadıysa True. Flood fill pahalı olduğu için en fazla
+        COMPLETION_CHECK_EVERY adımda bir ve sadece harita değiştiyse yapılır.
+        """
+        if self.explored_ratio >= goal:
+            return True
+        self.steps_since_check += 1
+        if self.steps_since_check < self.COMPLETION_CHECK_EVERY or self.unknown_count == self.checked_unknown:
+            return False
+        if self.known_map[cell] == VAL_WALL:
+            return False # Sekerken duvar karesine taşmış; sonraki adımda bakılır
+        self.steps_since_check = 0
+        self.checked_unknown = self.unknown_count
+        return self.observation_complete(cell, view_range)